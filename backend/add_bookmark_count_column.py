@@ -0,0 +1,48 @@
+"""
+Script to add the 'bookmark_count' column to the experiences table.
+Existing counts are filled in from the bookmarks table.
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The column will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(experiences)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'bookmark_count' in columns:
+        print("Column 'bookmark_count' already exists in experiences table.")
+    else:
+        # Add the column, backfill it and index it for sort=popular
+        cursor.execute("ALTER TABLE experiences ADD COLUMN bookmark_count INTEGER NOT NULL DEFAULT 0")
+        cursor.execute(
+            "UPDATE experiences SET bookmark_count = "
+            "(SELECT COUNT(*) FROM bookmarks WHERE bookmarks.experience_id = experiences.id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_experiences_published_popularity "
+            "ON experiences (is_published, bookmark_count, id)"
+        )
+        conn.commit()
+        print("Successfully added 'bookmark_count' column to experiences table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The column will be created automatically for new databases.")
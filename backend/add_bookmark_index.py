@@ -0,0 +1,48 @@
+"""
+Script to add the unique (user_id, experience_id) index to the bookmarks table.
+Duplicate bookmarks are removed first (the oldest one is kept).
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The index will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if index already exists
+    cursor.execute("PRAGMA index_list(bookmarks)")
+    indexes = [index[1] for index in cursor.fetchall()]
+    
+    if 'ix_bookmarks_user_experience' in indexes:
+        print("Index 'ix_bookmarks_user_experience' already exists on bookmarks table.")
+    else:
+        # Drop duplicates, then add the unique index
+        cursor.execute(
+            "DELETE FROM bookmarks WHERE id NOT IN "
+            "(SELECT MIN(id) FROM bookmarks GROUP BY user_id, experience_id)"
+        )
+        print(f"Removed {cursor.rowcount} duplicate bookmarks.")
+        cursor.execute(
+            "CREATE UNIQUE INDEX ix_bookmarks_user_experience "
+            "ON bookmarks (user_id, experience_id)"
+        )
+        conn.commit()
+        print("Successfully added 'ix_bookmarks_user_experience' index to bookmarks table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The index will be created automatically for new databases.")
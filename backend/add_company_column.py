@@ -0,0 +1,41 @@
+"""
+Script to add the 'company_id' column to the experiences table.
+Run this once to update your existing database; the server links existing
+experiences to the company registry on its next start.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The column will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if column already exists
+    cursor.execute("PRAGMA table_info(experiences)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'company_id' in columns:
+        print("Column 'company_id' already exists in experiences table.")
+    else:
+        # Add the company_id column and its index
+        cursor.execute("ALTER TABLE experiences ADD COLUMN company_id INTEGER REFERENCES companies(id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_experiences_company_id ON experiences (company_id)")
+        conn.commit()
+        print("Successfully added 'company_id' column to experiences table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The column will be created automatically for new databases.")
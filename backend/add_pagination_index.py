@@ -0,0 +1,57 @@
+"""
+Script to add the (created_at, id) index used by keyset pagination, and to
+rewrite stored timestamps in the whole-second form the models now write.
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The index will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if index already exists
+    cursor.execute("PRAGMA index_list(experiences)")
+    indexes = [index[1] for index in cursor.fetchall()]
+    
+    if 'ix_experiences_created_at_id' in indexes:
+        print("Index 'ix_experiences_created_at_id' already exists on experiences table.")
+    else:
+        cursor.execute(
+            "CREATE INDEX ix_experiences_created_at_id "
+            "ON experiences (created_at, id)"
+        )
+        print("Successfully added 'ix_experiences_created_at_id' index to experiences table.")
+    
+    # Timestamps written from Python carried microseconds ("...:SS.ffffff") and
+    # didn't compare equal to CURRENT_TIMESTAMP ones ("...:SS"); store one form
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    for (table,) in cursor.fetchall():
+        cursor.execute(f'PRAGMA table_info("{table}")')
+        for column in cursor.fetchall():
+            name, column_type = column[1], (column[2] or "").upper()
+            if column_type == "DATETIME":
+                cursor.execute(
+                    f'UPDATE "{table}" SET "{name}" = strftime(\'%Y-%m-%d %H:%M:%S\', "{name}") '
+                    f'WHERE "{name}" IS NOT NULL AND "{name}" != strftime(\'%Y-%m-%d %H:%M:%S\', "{name}")'
+                )
+                if cursor.rowcount:
+                    print(f"Normalised {cursor.rowcount} timestamps in {table}.{name}")
+    
+    conn.commit()
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The index will be created automatically for new databases.")
@@ -0,0 +1,41 @@
+"""
+Script to add the (is_published, created_at) index used by /analytics/timeseries.
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The index will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if index already exists
+    cursor.execute("PRAGMA index_list(experiences)")
+    indexes = [index[1] for index in cursor.fetchall()]
+    
+    if 'ix_experiences_published_created_at' in indexes:
+        print("Index 'ix_experiences_published_created_at' already exists on experiences table.")
+    else:
+        cursor.execute(
+            "CREATE INDEX ix_experiences_published_created_at "
+            "ON experiences (is_published, created_at)"
+        )
+        conn.commit()
+        print("Successfully added 'ix_experiences_published_created_at' index to experiences table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The index will be created automatically for new databases.")
@@ -0,0 +1,41 @@
+"""
+Script to add the experiences.user_id index used by the college statistics join.
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("The index will be created automatically when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if index already exists
+    cursor.execute("PRAGMA index_list(experiences)")
+    indexes = [index[1] for index in cursor.fetchall()]
+    
+    if 'ix_experiences_user_id' in indexes:
+        print("Index 'ix_experiences_user_id' already exists on experiences table.")
+    else:
+        cursor.execute(
+            "CREATE INDEX ix_experiences_user_id "
+            "ON experiences (user_id)"
+        )
+        conn.commit()
+        print("Successfully added 'ix_experiences_user_id' index to experiences table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, you may need to recreate the database.")
+    print("The index will be created automatically for new databases.")
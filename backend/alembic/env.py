@@ -10,7 +10,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.db.database import Base
-from app.db.models import User, Experience, Bookmark, Admin, AuditLog
+from app.db.models import (
+    User, Experience, Bookmark, Admin, AuditLog, Company, CompanyAlias,
+    AnalyticsRollup, AnalyticsCounter, QuestionCluster, QuestionLshBucket,
+    ExperienceQuestion, CompanyQuestionCount, PackageSketch, AnalyticsSnapshot,
+    PreparationGuide, CompanyProfile
+)
 from app.core.config import settings
 
 # this is the Alembic Config object
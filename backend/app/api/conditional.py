@@ -0,0 +1,126 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Tuple
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# State of one table slice: (row count, latest created_at/updated_at)
+TableState = Tuple[int, Optional[datetime]]
+
+
+class ResourceVersion:
+    """Cheap validator for a read endpoint's response"""
+
+    def __init__(self, etag: str, last_modified: Optional[datetime]):
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive timestamps; they are stored as UTC
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def table_state(db: Session, model: Any, *criteria) -> TableState:
+    """Row count and newest change time for the rows matching criteria.
+
+    One aggregate query with no row loading; any insert, delete or update
+    (updated_at is bumped on every UPDATE) moves at least one of the values.
+    Models without updated_at (insert/delete only, like bookmarks) are
+    versioned by count and created_at.
+    """
+    columns = [model.created_at]
+    if hasattr(model, "updated_at"):
+        columns.append(model.updated_at)
+    count, *maxima = db.query(
+        func.count(model.id),
+        *[func.max(column) for column in columns]
+    ).filter(*criteria).one()
+
+    stamps = [_as_utc(stamp) for stamp in maxima if stamp]
+    return count, max(stamps) if stamps else None
+
+
+def resource_version(scope: str, *states: TableState) -> ResourceVersion:
+    """Combine table states into an ETag/Last-Modified pair for one representation.
+
+    scope must identify the representation, e.g. the path plus query string.
+    """
+    digest = hashlib.sha1(scope.encode("utf-8"))
+    last_modified = None
+    for count, stamp in states:
+        digest.update(f"|{count}|{stamp.isoformat() if stamp else ''}".encode("utf-8"))
+        if stamp and (last_modified is None or stamp > last_modified):
+            last_modified = stamp
+
+    return ResourceVersion(f'W/"{digest.hexdigest()[:20]}"', last_modified)
+
+
+def request_scope(request: Request) -> str:
+    """Representation key for a request: path and query string"""
+    return f"{request.url.path}?{request.url.query}"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are equivalent for GET
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, version: ResourceVersion) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against version"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, version.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and version.last_modified:
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates carry whole seconds only
+        return version.last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def apply_version_headers(response: Response, version: ResourceVersion) -> None:
+    response.headers["ETag"] = version.etag
+    if version.last_modified:
+        response.headers["Last-Modified"] = format_datetime(version.last_modified, usegmt=True)
+    # Clients must revalidate, which is now a cheap 304 when nothing changed
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    version: ResourceVersion
+) -> Optional[Response]:
+    """Return a 304 response when the client's copy is current.
+
+    Otherwise stamp the validators onto `response` and return None so the
+    endpoint goes on to build the body.
+    """
+    if is_not_modified(request, version):
+        not_modified = Response(status_code=304)
+        apply_version_headers(not_modified, version)
+        return not_modified
+
+    apply_version_headers(response, version)
+    return None
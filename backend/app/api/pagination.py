@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, or_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Response header carrying the opaque token for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key_column, key_value: Any, row_id: int) -> str:
+    """Encode the last row's sort key and id as an opaque cursor token"""
+    if isinstance(key_value, datetime):
+        key_value = key_value.isoformat()
+    payload = json.dumps({"s": key_column.key, "k": key_value, "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_column) -> Tuple[Any, int]:
+    """Decode a cursor token back into (sort key, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        # A cursor is only valid for the sort order that produced it
+        if payload["s"] != key_column.key:
+            raise ValueError("cursor belongs to another sort order")
+        key_value, row_id = payload["k"], int(payload["i"])
+        if isinstance(key_column.type, DateTime) and key_value is not None:
+            key_value = datetime.fromisoformat(key_value)
+        return key_value, row_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_paginate(
+    query: Query,
+    key_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of rows ordered by (key_column, id_column) descending.
+
+    Rows strictly after the cursor position are fetched with a seek predicate
+    instead of OFFSET, so every page costs the same regardless of its depth.
+    """
+    if cursor:
+        key_value, row_id = decode_cursor(cursor, key_column)
+        query = query.filter(
+            or_(
+                key_column < key_value,
+                and_(key_column == key_value, id_column < row_id)
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(key_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            key_column, getattr(last, key_column.key), getattr(last, id_column.key)
+        )
+
+    return rows, next_cursor
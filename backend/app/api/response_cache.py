@@ -0,0 +1,97 @@
+import functools
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.cache import cache
+from app.core.config import settings
+from app.db.models import Experience
+from app.services.company_registry import find_company
+from app.api.conditional import ResourceVersion, is_not_modified, request_scope
+
+# Invalidation tags. Company-scoped entries depend only on that company's
+# experiences; role filters are substring matches, so any change can affect
+# them; everything else depends on all published experiences.
+ALL_EXPERIENCES_TAG = "experiences"
+ROLES_TAG = "roles"
+
+_VALIDATOR_HEADERS = ("ETag", "Last-Modified", "Cache-Control")
+
+
+def company_tag(company_id: int) -> str:
+    return f"company:{company_id}"
+
+
+def scope_tags(db: Session, company_name: Optional[str] = None, role: Optional[str] = None) -> List[str]:
+    """Tags for a response filtered by company and/or role"""
+    tags = []
+    if company_name:
+        company = find_company(db, company_name)
+        # Unknown names may start matching once their first experience is published
+        tags.append(company_tag(company.id) if company else ALL_EXPERIENCES_TAG)
+    if role:
+        tags.append(ROLES_TAG)
+    return tags or [ALL_EXPERIENCES_TAG]
+
+
+def experience_tags(*experiences: Experience) -> List[str]:
+    """Tags to invalidate when experiences are created, changed or (un)published"""
+    tags = [ALL_EXPERIENCES_TAG, ROLES_TAG]
+    tags.extend(company_tag(exp.company_id) for exp in experiences if exp.company_id)
+    return tags
+
+
+def invalidate(tags: Iterable[str]) -> None:
+    cache.invalidate(*tags)
+
+
+def cached(
+    namespace: str,
+    tags: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+    ttl: Optional[int] = None,
+    condition: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    key: Optional[Callable[[Dict[str, Any]], str]] = None
+):
+    """Cache a read endpoint's JSON body together with its validator headers.
+
+    The endpoint must take `request` and `response` parameters. `tags`
+    receives the endpoint's keyword arguments and names what the response
+    depends on; invalidate() with any of those tags drops the entry. When
+    `condition` is given, only calls it approves are cached. Entries are
+    keyed by path and query string unless `key` maps the keyword arguments
+    to a normalised one. A hit skips the endpoint entirely, including its
+    ETag queries, and still answers If-None-Match with a 304.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request, response = kwargs.get("request"), kwargs.get("response")
+            skip = condition is not None and not condition(kwargs)
+            if skip or not cache.enabled or request is None or response is None:
+                return await func(*args, **kwargs)
+
+            entry_tags = tags(kwargs) if tags else [ALL_EXPERIENCES_TAG]
+            scope = key(kwargs) if key else request_scope(request)
+            entry_key = cache.versioned_key(f"{namespace}:{scope}", entry_tags)
+
+            entry = cache.get(entry_key)
+            if entry is not None:
+                headers = entry["headers"]
+                if "ETag" in headers and is_not_modified(request, ResourceVersion(headers["ETag"], None)):
+                    return Response(status_code=304, headers=headers)
+                response.headers.update(headers)
+                return entry["body"]
+
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                # 304s and other hand-built responses are not cached
+                return result
+
+            body = jsonable_encoder(result)
+            headers = {name: response.headers[name] for name in _VALIDATOR_HEADERS if name in response.headers}
+            cache.set(entry_key, {"body": body, "headers": headers}, ttl or settings.CACHE_TTL_SECONDS)
+            return body
+
+        return wrapper
+
+    return decorator
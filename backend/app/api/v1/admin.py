@@ -7,6 +7,11 @@ from app.schemas.experience import ExperienceResponse
 from app.schemas.user import UserResponse
 from app.core.security import get_password_hash, verify_password
 from app.core.config import settings
+from app.services.experience_service import with_author, to_experience_responses
+from app.services.publication import on_publication_change
+from app.services.analytics_snapshots import request_refresh
+from app.services.company_registry import merge_company_alias
+from app.api.response_cache import company_tag, experience_tags, invalidate
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -100,19 +105,11 @@ async def admin_login(request: AdminLoginRequest, db: Session = Depends(get_db))
 @router.get("/experiences/pending", response_model=List[ExperienceResponse])
 async def get_pending_experiences(db: Session = Depends(get_db)):
     """Get all pending experiences for approval"""
-    experiences = db.query(Experience).filter(
+    experiences = with_author(db.query(Experience)).filter(
         Experience.is_approved == False
     ).order_by(Experience.created_at.desc()).all()
     
-    results = []
-    for exp in experiences:
-        response = ExperienceResponse.model_validate(exp)
-        user = db.query(User).filter(User.id == exp.user_id).first()
-        if user:
-            response.user_name = user.full_name
-        results.append(response)
-    
-    return results
+    return to_experience_responses(experiences, reveal_author=True)
 
 
 @router.post("/experiences/approve", response_model=dict)
@@ -130,6 +127,8 @@ async def approve_experience(
             detail="Experience not found"
         )
     
+    was_published = experience.is_published
+    
     if request.action == "approve":
         experience.is_approved = True
         experience.is_published = True
@@ -142,6 +141,9 @@ async def approve_experience(
             detail="Invalid action. Use 'approve' or 'reject'"
         )
     
+    if experience.is_published != was_published:
+        on_publication_change(db, experience, experience.is_published)
+    
     # Create audit log
     audit_log = AuditLog(
         admin_id=admin_id,
@@ -152,6 +154,9 @@ async def approve_experience(
     )
     db.add(audit_log)
     db.commit()
+    invalidate(experience_tags(experience))
+    if experience.is_published != was_published:
+        request_refresh()
     
     return {"message": f"Experience {request.action}d successfully"}
 
@@ -162,22 +167,50 @@ async def get_all_experiences(
     db: Session = Depends(get_db)
 ):
     """Get all experiences (admin view)"""
-    query = db.query(Experience)
+    query = with_author(db.query(Experience))
     
     if approved_only:
         query = query.filter(Experience.is_approved == True)
     
     experiences = query.order_by(Experience.created_at.desc()).all()
     
-    results = []
-    for exp in experiences:
-        response = ExperienceResponse.model_validate(exp)
-        user = db.query(User).filter(User.id == exp.user_id).first()
-        if user:
-            response.user_name = user.full_name
-        results.append(response)
+    return to_experience_responses(experiences, reveal_author=True)
+
+
+class CompanyAliasRequest(BaseModel):
+    company_name: str  # Canonical company
+    alias: str  # Spelling that should resolve to it
+
+
+@router.post("/companies/aliases", response_model=dict)
+async def add_company_alias(
+    request: CompanyAliasRequest,
+    admin_id: int = 1,  # Simplified - in production, get from auth
+    db: Session = Depends(get_db)
+):
+    """Map an alternative spelling onto a canonical company, merging duplicates"""
+    if not request.company_name.strip() or not request.alias.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Company name and alias are required"
+        )
     
-    return results
+    company = merge_company_alias(db, request.alias, request.company_name)
+    
+    audit_log = AuditLog(
+        admin_id=admin_id,
+        action="alias",
+        entity_type="company",
+        entity_id=company.id,
+        details={"alias": request.alias}
+    )
+    db.add(audit_log)
+    db.commit()
+    # Experiences moved onto this company, and its display name may have changed
+    invalidate(experience_tags() + [company_tag(company.id)])
+    request_refresh()
+    
+    return {"message": f"'{request.alias}' now resolves to {company.name}", "company_id": company.id}
 
 
 @router.get("/audit-logs", response_model=List[dict])
@@ -1,178 +1,356 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List, Dict, Any
+from sqlalchemy import case, false, func
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Any, Optional, Tuple
 from app.db.database import get_db
-from app.db.models import Experience, User
-from collections import Counter
+from app.db.models import AnalyticsRollup, AnalyticsSnapshot, Company, Experience, PackageSketch, User
+from app.services.analytics_service import (
+    EMPTY_COMPANY_STATS,
+    college_rows,
+    college_stats,
+    company_stats,
+    page_college_rows,
+    rollup_summary,
+    top_rollup_counts,
+    trends
+)
+from app.services.analytics_snapshots import get_snapshot, snapshot_age, snapshot_time
+from app.services.column_store import GROUP_KEYS, column_store
+from app.services.company_registry import find_company
+from app.services.package_sketches import merged_sketch
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.response_cache import cached, scope_tags
+from app.api.conditional import (
+    conditional_response,
+    request_scope,
+    resource_version,
+    table_state
+)
 
 router = APIRouter()
 
+# Seconds since the served snapshot was computed (absent on live responses)
+SNAPSHOT_AGE_HEADER = "X-Snapshot-Age"
+
+
+def published_version(request: Request, db: Session):
+    """Validator for responses derived from the published experiences"""
+    return resource_version(
+        request_scope(request),
+        table_state(db, Experience, Experience.is_published == True)
+    )
+
+
+def _from_snapshot(
+    request: Request,
+    response: Response,
+    db: Session,
+    name: str
+) -> Tuple[Optional[Response], Optional[AnalyticsSnapshot]]:
+    """(304 response or None, snapshot) for an endpoint served from a precomputed snapshot.
+
+    The snapshot is None when none is being maintained; the caller then
+    computes the response live.
+    """
+    snapshot = get_snapshot(db, name)
+    if snapshot is None:
+        return None, None
+    
+    version = resource_version(request_scope(request), (snapshot.id, snapshot_time(snapshot)))
+    not_modified = conditional_response(request, response, version)
+    response.headers[SNAPSHOT_AGE_HEADER] = str(snapshot_age(snapshot))
+    return not_modified, snapshot
+
 
 @router.get("/company-stats", response_model=Dict[str, Any])
+@cached(
+    "company-stats",
+    tags=lambda kw: scope_tags(kw["db"], kw["company_name"]),
+    condition=lambda kw: bool(kw["company_name"])
+)
 async def get_company_statistics(
+    request: Request,
+    response: Response,
     company_name: str = None,
     db: Session = Depends(get_db)
 ):
-    """Get statistics for a specific company or all companies"""
-    query = db.query(Experience).filter(Experience.is_published == True)
+    """Get statistics for a specific company or all companies.
+
+    The all-companies view is served from the background snapshot when one
+    is available.
+    """
+    if not company_name:
+        not_modified, snapshot = _from_snapshot(request, response, db, "company-stats")
+        if not_modified:
+            return not_modified
+        if snapshot:
+            return snapshot.payload
     
-    if company_name:
-        query = query.filter(Experience.company_name.ilike(f"%{company_name}%"))
+    not_modified = conditional_response(request, response, published_version(request, db))
+    if not_modified:
+        return not_modified
     
-    experiences = query.all()
+    # Unknown company names have no experiences rather than falling back to a scan
+    company = find_company(db, company_name) if company_name else None
+    if company_name and not company:
+        return EMPTY_COMPANY_STATS
+    
+    return company_stats(db, company)
+
+
+@router.get("/role-stats", response_model=Dict[str, Any])
+@cached("role-stats", tags=lambda kw: scope_tags(kw["db"], role=kw["role"]))
+async def get_role_statistics(
+    role: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Get statistics for a specific role"""
+    not_modified = conditional_response(request, response, published_version(request, db))
+    if not_modified:
+        return not_modified
     
-    if not experiences:
+    criteria = [AnalyticsRollup.role.ilike(f"%{role}%")]
+    
+    total, selection_rate, avg_package = rollup_summary(db, criteria)
+    if not total:
         return {
+            "role": role,
             "total_experiences": 0,
             "companies": [],
-            "roles": [],
             "selection_rate": 0,
             "average_package": 0
         }
     
-    # Calculate statistics
-    total = len(experiences)
-    selected = sum(1 for exp in experiences if exp.final_result == "Selected")
-    selection_rate = (selected / total * 100) if total > 0 else 0
+    return {
+        "role": role,
+        "total_experiences": total,
+        "companies": top_rollup_counts(db, Company.name, criteria),
+        "selection_rate": selection_rate,
+        "average_package": avg_package
+    }
+
+
+@router.get("/trends", response_model=Dict[str, Any])
+async def get_trends(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Get placement trends and insights (from the background snapshot when available)"""
+    not_modified, snapshot = _from_snapshot(request, response, db, "trends")
+    if not_modified:
+        return not_modified
+    if snapshot:
+        return snapshot.payload
+    
+    not_modified = conditional_response(request, response, published_version(request, db))
+    if not_modified:
+        return not_modified
+    
+    return trends(db)
+
+
+def _period_start(db: Session, interval: str):
+    """SQL expression truncating created_at to the start of its week (Monday) or month"""
+    if db.bind.dialect.name == "sqlite":
+        if interval == "week":
+            return func.date(Experience.created_at, "-6 days", "weekday 1")
+        return func.strftime("%Y-%m-01", Experience.created_at)
+    return func.date_trunc(interval, Experience.created_at)
+
+
+@router.get("/timeseries", response_model=Dict[str, Any])
+@cached("timeseries", tags=lambda kw: scope_tags(kw["db"], kw["company_name"], kw["role"]))
+async def get_timeseries(
+    request: Request,
+    response: Response,
+    interval: str = Query("month", pattern="^(week|month)$"),
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """Get experience volume, selection rate and package stats per week or month.
+
+    Bucketing and aggregation run in one GROUP BY; the published range scan
+    is served by the (is_published, created_at) index.
+    """
+    not_modified = conditional_response(request, response, published_version(request, db))
+    if not_modified:
+        return not_modified
     
-    # Average package
-    packages = [exp.package_offered for exp in experiences if exp.package_offered]
-    avg_package = sum(packages) / len(packages) if packages else 0
+    result = {"interval": interval, "company_name": company_name, "role": role, "series": []}
     
-    # Company distribution
-    companies = Counter([exp.company_name for exp in experiences])
+    criteria = [Experience.is_published == True]
+    if company_name:
+        company = find_company(db, company_name)
+        if not company:
+            return result
+        criteria.append(Experience.company_id == company.id)
+    if role:
+        criteria.append(Experience.role.ilike(f"%{role}%"))
+    if start:
+        criteria.append(Experience.created_at >= datetime.combine(start, time.min))
+    if end:
+        criteria.append(Experience.created_at < datetime.combine(end + timedelta(days=1), time.min))
     
-    # Role distribution
-    roles = Counter([exp.role for exp in experiences])
+    period = _period_start(db, interval).label("period")
+    total = func.count(Experience.id)
+    selected = func.sum(case((Experience.final_result == "Selected", 1), else_=0))
+    # Zero packages mean "not disclosed", like NULLs, and are left out of the package stats
+    package = case((Experience.package_offered > 0, Experience.package_offered))
     
-    # Most asked questions
-    all_questions = []
-    for exp in experiences:
-        if exp.questions_asked:
-            for category, questions in exp.questions_asked.items():
-                if isinstance(questions, list):
-                    all_questions.extend(questions)
+    rows = db.query(
+        period,
+        total,
+        selected,
+        func.avg(package),
+        func.min(package),
+        func.max(package)
+    ).filter(*criteria).group_by(period).order_by(period).all()
     
-    top_questions = Counter(all_questions).most_common(10)
+    for bucket, bucket_total, bucket_selected, avg_package, min_package, max_package in rows:
+        if isinstance(bucket, datetime):
+            bucket = bucket.date().isoformat()
+        result["series"].append({
+            "period": bucket,
+            "total_experiences": bucket_total,
+            "selection_rate": round(bucket_selected / bucket_total * 100, 2),
+            "average_package": round(avg_package, 2) if avg_package is not None else 0,
+            "min_package": min_package,
+            "max_package": max_package
+        })
     
-    return {
-        "total_experiences": total,
-        "companies": dict(companies.most_common(10)),
-        "roles": dict(roles.most_common(10)),
-        "selection_rate": round(selection_rate, 2),
-        "average_package": round(avg_package, 2),
-        "top_questions": [{"question": q, "count": c} for q, c in top_questions]
-    }
+    return result
 
 
-@router.get("/role-stats", response_model=Dict[str, Any])
-async def get_role_statistics(
-    role: str,
+@router.get("/package-distribution", response_model=Dict[str, Any])
+@cached("package-distribution", tags=lambda kw: scope_tags(kw["db"], kw["company_name"], kw["role"]))
+async def get_package_distribution(
+    request: Request,
+    response: Response,
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    college_name: Optional[str] = None,
+    bins: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    """Get statistics for a specific role"""
-    experiences = db.query(Experience).filter(
-        and_(
-            Experience.role.ilike(f"%{role}%"),
-            Experience.is_published == True
+    """Get package percentiles and a histogram for a company, role or college.
+
+    Served from per-scope KLL quantile sketches; role and college matches,
+    and the unfiltered view, merge several sketches instead of reading
+    experiences.
+    """
+    if sum(1 for value in (company_name, role, college_name) if value) > 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filter by at most one of company_name, role or college_name"
         )
-    ).all()
     
-    if not experiences:
-        return {
-            "role": role,
-            "total_experiences": 0,
-            "companies": [],
-            "selection_rate": 0,
-            "average_package": 0
-        }
-    
-    total = len(experiences)
-    selected = sum(1 for exp in experiences if exp.final_result == "Selected")
-    selection_rate = (selected / total * 100) if total > 0 else 0
+    version = resource_version(
+        request_scope(request),
+        table_state(db, Experience, Experience.is_published == True),
+        table_state(db, User, User.college_name.isnot(None))
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
     
-    packages = [exp.package_offered for exp in experiences if exp.package_offered]
-    avg_package = sum(packages) / len(packages) if packages else 0
+    if company_name:
+        company = find_company(db, company_name)
+        sketch = merged_sketch(db, "company", PackageSketch.key == str(company.id) if company else false())
+    elif role:
+        sketch = merged_sketch(db, "role", PackageSketch.key.ilike(f"%{role}%"))
+    elif college_name:
+        sketch = merged_sketch(db, "college", PackageSketch.key.ilike(f"%{college_name}%"))
+    else:
+        sketch = merged_sketch(db, "company")
     
-    companies = Counter([exp.company_name for exp in experiences])
+    percentiles = {f"p{q}": sketch.quantile(q / 100) for q in (25, 50, 75, 90)}
     
     return {
+        "company_name": company_name,
         "role": role,
-        "total_experiences": total,
-        "companies": dict(companies.most_common(10)),
-        "selection_rate": round(selection_rate, 2),
-        "average_package": round(avg_package, 2)
+        "college_name": college_name,
+        "count": sketch.n,
+        "min_package": sketch.min,
+        "max_package": sketch.max,
+        "median_package": percentiles["p50"],
+        "percentiles": percentiles,
+        "histogram": sketch.histogram(bins)
     }
 
 
-@router.get("/trends", response_model=Dict[str, Any])
-async def get_trends(db: Session = Depends(get_db)):
-    """Get placement trends and insights"""
-    experiences = db.query(Experience).filter(
-        Experience.is_published == True
-    ).all()
-    
-    # Skills/technologies mentioned
-    all_resources = []
-    for exp in experiences:
-        if exp.resources_followed:
-            if isinstance(exp.resources_followed, list):
-                all_resources.extend(exp.resources_followed)
-    
-    top_resources = Counter(all_resources).most_common(10)
-    
-    # Rejection reasons analysis
-    rejection_reasons = []
-    for exp in experiences:
-        if exp.rejection_reasons and exp.final_result == "Rejected":
-            rejection_reasons.append(exp.rejection_reasons)
-    
-    # Difficulty analysis (if available in interview rounds)
-    difficulty_levels = []
-    for exp in experiences:
-        if exp.interview_rounds:
-            for round_data in exp.interview_rounds:
-                if isinstance(round_data, dict) and "difficulty" in round_data:
-                    difficulty_levels.append(round_data["difficulty"])
-    
-    difficulty_dist = Counter(difficulty_levels)
+@router.get("/breakdown", response_model=Dict[str, Any])
+@cached("breakdown", tags=lambda kw: scope_tags(kw["db"], kw["company_name"], kw["role"]))
+async def get_breakdown(
+    request: Request,
+    response: Response,
+    group_by: str = Query("company", pattern=f"^({'|'.join(GROUP_KEYS)})$"),
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """Ad-hoc breakdown of published experiences by company, role, month or result.
+
+    Computed with vectorised NumPy aggregations over the in-memory column
+    store, which only reads rows added or changed since its last refresh.
+    """
+    not_modified = conditional_response(request, response, published_version(request, db))
+    if not_modified:
+        return not_modified
     
-    return {
-        "top_resources": [{"resource": r, "count": c} for r, c in top_resources],
-        "rejection_reasons_count": len(rejection_reasons),
-        "difficulty_distribution": dict(difficulty_dist),
-        "total_experiences": len(experiences)
-    }
+    result = {"group_by": group_by, "company_name": company_name, "role": role, "groups": []}
+    
+    company = find_company(db, company_name) if company_name else None
+    if company_name and not company:
+        return result
+    
+    column_store.refresh(db)
+    result["groups"] = column_store.aggregate(
+        db,
+        group_by,
+        company_id=company.id if company else None,
+        role=role,
+        limit=limit
+    )
+    return result
 
 
 @router.get("/college-stats", response_model=Dict[str, Any])
-async def get_college_statistics(db: Session = Depends(get_db)):
-    """Get statistics by college"""
-    users = db.query(User).filter(User.college_name.isnot(None)).all()
-    
-    college_experiences = {}
-    for user in users:
-        if user.college_name:
-            college = user.college_name
-            if college not in college_experiences:
-                college_experiences[college] = []
-            
-            user_exps = db.query(Experience).filter(
-                and_(
-                    Experience.user_id == user.id,
-                    Experience.is_published == True
-                )
-            ).all()
-            college_experiences[college].extend(user_exps)
-    
-    college_stats = {}
-    for college, exps in college_experiences.items():
-        if exps:
-            selected = sum(1 for exp in exps if exp.final_result == "Selected")
-            college_stats[college] = {
-                "total_experiences": len(exps),
-                "selection_rate": round((selected / len(exps) * 100), 2) if exps else 0
-            }
-    
-    return college_stats
+async def get_college_statistics(
+    request: Request,
+    response: Response,
+    sort: str = Query("volume", pattern="^(volume|selection_rate)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Get statistics by college, largest (or most successful) first.
+
+    Pages come from the background snapshot when available, otherwise from
+    one join and GROUP BY over users and published experiences; results are
+    paged with limit/offset.
+    """
+    not_modified, snapshot = _from_snapshot(request, response, db, "college-stats")
+    if not_modified:
+        return not_modified
+    if snapshot:
+        return college_stats(page_college_rows(snapshot.payload, sort, limit, offset))
+    
+    # Colleges come from user profiles, so their changes count too
+    version = resource_version(
+        request_scope(request),
+        table_state(db, Experience, Experience.is_published == True),
+        table_state(db, User, User.college_name.isnot(None))
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
+    
+    return college_stats(college_rows(db, sort, limit, offset))
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional, Set
 import httpx
 from app.core.config import settings
+from app.services.keyword_taxonomy import keyword_matcher
 
 router = APIRouter()
 
@@ -17,26 +18,19 @@ class ChatResponse(BaseModel):
     conversation_id: str
 
 
-# Campus interview related keywords
-CAMPUS_KEYWORDS = [
-    "interview", "placement", "campus", "company", "round", "question",
-    "preparation", "resume", "coding", "dsa", "technical", "hr", "managerial",
-    "offer", "package", "rejection", "selected", "experience", "skill",
-    "leetcode", "hackerrank", "codeforces", "project", "internship"
-]
-
-
-def is_campus_related(message: str) -> bool:
-    """Check if message is related to campus interviews"""
-    message_lower = message.lower()
-    return any(keyword in message_lower for keyword in CAMPUS_KEYWORDS)
+def is_campus_related(matches: Dict[str, Set[str]]) -> bool:
+    """Check if a scanned message is related to campus interviews (keywords in the "campus" taxonomy)"""
+    return bool(matches.get("campus"))
 
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_bot(request: ChatMessage):
     """Chat with campus interview bot"""
+    # One keyword scan serves both the topic check and the fallback answer
+    matches = keyword_matcher.scan(request.message)
+    
     # Check if message is campus interview related
-    if not is_campus_related(request.message):
+    if not is_campus_related(matches):
         return ChatResponse(
             response="I'm CampusHire AI, specialized in helping with campus interview preparation. Please ask me questions about interviews, placements, preparation strategies, or company-specific guidance.",
             conversation_id=request.conversation_id or "default"
@@ -73,11 +67,11 @@ async def chat_with_bot(request: ChatMessage):
                 bot_response = result.get("response", "I apologize, but I couldn't generate a response. Please try again.")
             else:
                 # Fallback response if Ollama is not available
-                bot_response = generate_fallback_response(request.message)
+                bot_response = generate_fallback_response(matches)
     
     except Exception as e:
         # Fallback if Ollama is not running
-        bot_response = generate_fallback_response(request.message)
+        bot_response = generate_fallback_response(matches)
     
     return ChatResponse(
         response=bot_response,
@@ -85,11 +79,11 @@ async def chat_with_bot(request: ChatMessage):
     )
 
 
-def generate_fallback_response(message: str) -> str:
+def generate_fallback_response(matches: Dict[str, Set[str]]) -> str:
     """Generate a fallback response when AI is unavailable"""
-    message_lower = message.lower()
+    topics = matches.get("chat_topic", set())
     
-    if any(word in message_lower for word in ["dsa", "data structure", "algorithm", "coding"]):
+    if "dsa" in topics:
         return """For DSA preparation, I recommend:
 1. Start with basics: Arrays, Strings, Linked Lists, Stacks, Queues
 2. Practice on platforms like LeetCode, HackerRank, Codeforces
@@ -97,7 +91,7 @@ def generate_fallback_response(message: str) -> str:
 4. Solve company-specific problems from previous experiences
 5. Time yourself while solving problems to improve speed"""
     
-    elif any(word in message_lower for word in ["resume", "cv", "curriculum"]):
+    elif "resume" in topics:
         return """For resume tips:
 1. Keep it concise (1-2 pages)
 2. Highlight relevant projects and internships
@@ -107,7 +101,7 @@ def generate_fallback_response(message: str) -> str:
 6. Use action verbs and quantify achievements
 7. Ensure no grammatical errors"""
     
-    elif any(word in message_lower for word in ["hr", "human resource", "behavioral"]):
+    elif "hr" in topics:
         return """For HR round preparation:
 1. Prepare answers for common questions: Tell me about yourself, Why this company?
 2. Research the company's values and culture
@@ -116,7 +110,7 @@ def generate_fallback_response(message: str) -> str:
 5. Be confident and maintain eye contact
 6. Show enthusiasm and genuine interest"""
     
-    elif any(word in message_lower for word in ["technical", "round", "interview"]):
+    elif "technical" in topics:
         return """For technical interviews:
 1. Revise core CS fundamentals: OS, DBMS, Networks, OOP
 2. Practice coding problems daily
@@ -1,28 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import false
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from app.db.database import get_db
-from app.db.models import Experience
+from app.db.models import Company, Experience, PreparationGuide
 from app.services.ai_service import AIService
+from app.services import question_bank
+from app.services.autocomplete import MAX_SUGGESTIONS, company_index
+from app.services.company_profiles import get_profile, top_values
+from app.services.company_registry import find_company
+from app.services.preparation_guides import get_preparation_tips
+from app.api.conditional import (
+    conditional_response,
+    request_scope,
+    resource_version,
+    table_state
+)
+from app.api.response_cache import cached, scope_tags
 from app.api.dependencies import get_current_user
 from app.db.models import User
 
 router = APIRouter()
 ai_service = AIService()
 
+
+def _guide_experience_ids(db: Session, company: Company) -> List[int]:
+    """Ids of the published experiences a preparation guide is generated from (the newest 10)"""
+    rows = db.query(Experience.id).filter(
+        Experience.company_id == company.id,
+        Experience.is_published == True
+    ).order_by(Experience.created_at.desc(), Experience.id.desc()).limit(10)
+    return [experience_id for experience_id, in rows]
+
+
+def _with_default_tips(company_name: str, preparation_tips: List[str]) -> List[str]:
+    # If AI didn't generate enough tips, add defaults
+    if len(preparation_tips) < 5:
+        preparation_tips.extend([
+            f"Focus on {company_name}'s core technologies and values",
+            "Practice coding problems daily on platforms like LeetCode",
+            "Prepare for multiple interview rounds",
+            "Research the company's recent projects and initiatives",
+            "Practice explaining your thought process clearly"
+        ])
+    return preparation_tips[:7]
+
+
+def _fallback_tips(company_name: str) -> List[str]:
+    return [
+        f"Research {company_name}'s interview process and expectations",
+        "Practice Data Structures and Algorithms problems",
+        "Prepare for technical coding rounds",
+        "Review system design concepts (for senior roles)",
+        "Practice behavioral questions and STAR method",
+        "Build projects relevant to the role",
+        "Prepare questions to ask the interviewer"
+    ]
+
+
+@router.get("/autocomplete", response_model=List[Dict[str, Any]])
+async def autocomplete_companies(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(MAX_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS)
+):
+    """Company names starting with prefix, most experiences first.
+
+    Answered from an in-memory prefix index; no database access.
+    """
+    return company_index.suggest(prefix, limit)
+
+
 @router.get("/{company_name}/suggestions")
+@cached("company-suggestions", tags=lambda kw: scope_tags(kw["db"], kw["company_name"]))
 async def get_company_suggestions(
     company_name: str,
+    request: Request,
+    response: Response,
+    ai: str = Query("inline", pattern="^(inline|deferred)$"),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
-    """Get AI-powered suggestions for a specific company"""
-    # Get all published experiences for this company
-    experiences = db.query(Experience).filter(
-        Experience.company_name.ilike(f"%{company_name}%"),
-        Experience.is_published == True
-    ).all()
+    """Get AI-powered suggestions for a specific company.
+
+    Preparation tips wait at most AI_TIPS_LATENCY_BUDGET_SECONDS for the
+    model before falling back to generic tips. With ai=deferred the
+    sections derived from experiences are returned at once; if the tips
+    still need the model, preparation_tips_status is "pending" and
+    preparation_tips_url delivers them when generation finishes.
+    """
+    company = find_company(db, company_name)
+    
+    # Suggestions only change when this company's published experiences or its guide do
+    criteria = [Experience.company_id == company.id] if company else [false()]
+    guide_criteria = [PreparationGuide.company_key == company.normalized_name] if company else [false()]
+    version = resource_version(
+        request_scope(request),
+        table_state(db, Experience, Experience.is_published == True, *criteria),
+        table_state(db, PreparationGuide, *guide_criteria)
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
     
-    if not experiences:
+    # Rounds and skills are kept ranked in the company's profile row
+    profile = get_profile(db, company.id) if company else None
+    
+    if not profile or not profile.experience_count:
         return {
             "company_name": company_name,
             "interview_questions": [],
@@ -31,101 +113,81 @@ async def get_company_suggestions(
             "common_rounds": []
         }
     
-    # Extract common patterns
-    all_questions = []
-    all_skills = []
-    all_rounds = []
-    
-    for exp in experiences:
-        # Extract questions
-        if exp.questions_asked:
-            if isinstance(exp.questions_asked, dict):
-                for category, questions in exp.questions_asked.items():
-                    if isinstance(questions, list):
-                        all_questions.extend(questions[:3])  # Top 3 per category
-        
-        # Extract rounds
-        if exp.interview_rounds:
-            if isinstance(exp.interview_rounds, list):
-                for round_data in exp.interview_rounds:
-                    if isinstance(round_data, dict):
-                        round_name = round_data.get('round_name') or round_data.get('round_type', 'Unknown')
-                        all_rounds.append(round_name)
-        
-        # Extract skills from preparation strategy
-        if exp.preparation_strategy:
-            # Simple keyword extraction (can be enhanced with AI)
-            strategy_lower = exp.preparation_strategy.lower()
-            if 'dsa' in strategy_lower or 'data structure' in strategy_lower:
-                all_skills.append('Data Structures & Algorithms')
-            if 'system design' in strategy_lower:
-                all_skills.append('System Design')
-            if 'coding' in strategy_lower or 'programming' in strategy_lower:
-                all_skills.append('Coding Practice')
-            if 'oops' in strategy_lower or 'object oriented' in strategy_lower:
-                all_skills.append('Object-Oriented Programming')
-    
-    # Get unique values
-    unique_questions = list(set(all_questions))[:10]  # Top 10 unique questions
-    unique_skills = list(set(all_skills))[:8]  # Top 8 unique skills
-    unique_rounds = list(set(all_rounds))[:6]  # Top 6 unique rounds
+    # Questions are ranked by cluster, the same way company-stats ranks them
+    top_questions = [text for text, _ in question_bank.top_questions(db, company.id, limit=8)]
+    top_skills = top_values(profile.skills, 6)
+    top_rounds = top_values(profile.rounds, 5)
     
     # Generate AI suggestions
+    tips_status, tips_url = "ready", None
     try:
-        # Use AI service to generate comprehensive suggestions
-        preparation_guide = await ai_service.generate_preparation_guide(
-            company_name=company_name,
-            role="Software Engineer",  # Default role, can be made dynamic
-            experiences=experiences[:10]  # Use top 10 experiences
+        # Guides are persisted per company and regenerated only when its experiences change
+        preparation_tips = await get_preparation_tips(
+            db, ai_service, company, _guide_experience_ids(db, company), wait=ai == "inline"
         )
-        
-        # Parse preparation guide for tips
-        preparation_tips = []
-        if preparation_guide:
-            lines = preparation_guide.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('•') or line.startswith('*')):
-                    tip = line.lstrip('-•*').strip()
-                    if tip and len(tip) > 10:
-                        preparation_tips.append(tip)
-        
-        # If AI didn't generate enough tips, add defaults
-        if len(preparation_tips) < 5:
-            preparation_tips.extend([
-                f"Focus on {company_name}'s core technologies and values",
-                "Practice coding problems daily on platforms like LeetCode",
-                "Prepare for multiple interview rounds",
-                "Research the company's recent projects and initiatives",
-                "Practice explaining your thought process clearly"
-            ])
+        if preparation_tips is not None:
+            preparation_tips = _with_default_tips(company_name, preparation_tips)
+        elif ai == "deferred":
+            tips_status = "pending"
+            tips_url = request.url_for("get_company_suggestion_tips", company_name=company_name).path
+            preparation_tips = []
+        else:
+            # The model is still running past the latency budget
+            tips_status = "fallback"
+            preparation_tips = _fallback_tips(company_name)
     except Exception:
         # Fallback suggestions
-        preparation_tips = [
-            f"Research {company_name}'s interview process and expectations",
-            "Practice Data Structures and Algorithms problems",
-            "Prepare for technical coding rounds",
-            "Review system design concepts (for senior roles)",
-            "Practice behavioral questions and STAR method",
-            "Build projects relevant to the role",
-            "Prepare questions to ask the interviewer"
-        ]
+        tips_status = "fallback"
+        preparation_tips = _fallback_tips(company_name)
     
     return {
         "company_name": company_name,
-        "interview_questions": unique_questions[:8],
-        "skills_to_build": unique_skills[:6] if unique_skills else [
+        "interview_questions": top_questions,
+        "skills_to_build": top_skills or [
             "Data Structures & Algorithms",
             "Problem Solving",
             "System Design",
             "Coding Practice",
             "Technical Communication"
         ],
-        "preparation_tips": preparation_tips[:7],
-        "common_rounds": unique_rounds[:5] if unique_rounds else [
+        "preparation_tips": preparation_tips,
+        "preparation_tips_status": tips_status,
+        "preparation_tips_url": tips_url,
+        "common_rounds": top_rounds or [
             "Online Assessment",
             "Technical Round",
             "HR Round"
         ],
-        "total_experiences": len(experiences)
+        "total_experiences": profile.experience_count
+    }
+
+
+@router.get("/{company_name}/suggestions/tips")
+async def get_company_suggestion_tips(
+    company_name: str,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Preparation tips for a company, for clients that asked for ai=deferred.
+
+    Waits for the model for at most AI_TIPS_LATENCY_BUDGET_SECONDS, then
+    answers with generic tips (status "fallback"); the guide still being
+    generated is stored and served by later requests.
+    """
+    company = find_company(db, company_name)
+    experience_ids = _guide_experience_ids(db, company) if company else []
+    if not experience_ids:
+        return {"company_name": company_name, "status": "ready", "preparation_tips": []}
+    
+    try:
+        preparation_tips = await get_preparation_tips(db, ai_service, company, experience_ids)
+    except Exception:
+        preparation_tips = None
+    
+    if preparation_tips is None:
+        return {"company_name": company_name, "status": "fallback", "preparation_tips": _fallback_tips(company_name)}
+    
+    return {
+        "company_name": company_name,
+        "status": "ready",
+        "preparation_tips": _with_default_tips(company_name, preparation_tips)
     }
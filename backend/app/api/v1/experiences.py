@@ -1,10 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from app.db.database import get_db
 from app.db.models import Experience, Bookmark, User
 from app.api.dependencies import get_current_user
+from app.services.experience_service import (
+    apply_experience_filters,
+    resolve_fields,
+    with_projection,
+    to_projected_dicts,
+    with_author,
+    to_experience_response,
+    to_experience_responses
+)
+from app.services.search_index import search_index
+from app.services.export_service import stream_csv, stream_ndjson
+from app.services.bulk_import import insert_experiences, parse_records, validate_records
+from app.services.bookmark_counts import increment_bookmark_count
+from app.services.company_registry import resolve_company
+from app.services.facets import BAND_LABELS, facet_counts, facet_key
+from app.api.response_cache import cached, company_tag, experience_tags, invalidate
+from app.api.conditional import (
+    conditional_response,
+    request_scope,
+    resource_version,
+    table_state
+)
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    keyset_paginate
+)
+from app.core.config import settings
 from app.schemas.experience import (
+    BulkImportResponse,
     ExperienceCreateRequest,
     ExperienceUpdateRequest,
     ExperienceResponse
@@ -13,6 +45,22 @@ from app.schemas.experience import (
 router = APIRouter()
 
 
+def _list_query(db: Session, fields: Optional[List[str]]):
+    """Base query for list endpoints: full rows with authors, or a column projection"""
+    if fields:
+        return with_projection(db.query(Experience), fields)
+    return with_author(db.query(Experience))
+
+
+def _projected_response(response: Response, items: List[dict]) -> JSONResponse:
+    """Send projected dicts as-is, keeping the headers already set on `response`"""
+    headers = {
+        key: value for key, value in response.headers.items()
+        if key.lower() != "content-length"
+    }
+    return JSONResponse(items, headers=headers)
+
+
 @router.post("/", response_model=ExperienceResponse)
 async def create_experience(
     request: ExperienceCreateRequest,
@@ -20,13 +68,16 @@ async def create_experience(
     db: Session = Depends(get_db)
 ):
     """Create a new interview experience"""
+    company = resolve_company(db, request.company_name)
     experience = Experience(
         user_id=current_user.id,
+        company_id=company.id if company else None,
         **request.dict()
     )
     db.add(experience)
     db.commit()
     db.refresh(experience)
+    invalidate(experience_tags(experience))
     
     # Use model_validate for Pydantic v2
     response = ExperienceResponse.model_validate(experience, from_attributes=True)
@@ -36,44 +87,104 @@ async def create_experience(
     return response
 
 
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_experiences(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import many experiences at once from a JSON array or NDJSON body.
+
+    Every record is validated first; the valid ones are then inserted in
+    batches inside a single transaction and invalid ones are reported by row.
+    """
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    try:
+        records, parse_errors = parse_records(await request.body(), ndjson)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid import body: {e}"
+        )
+    
+    if len(records) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many rows (max {settings.BULK_IMPORT_MAX_ROWS})"
+        )
+    
+    valid, errors = validate_records(records, parse_errors)
+    inserted = insert_experiences(
+        db,
+        current_user.id,
+        [experience for _, experience in valid],
+        settings.BULK_IMPORT_BATCH_SIZE
+    ) if valid else 0
+    if inserted:
+        invalidate(experience_tags())
+    
+    return BulkImportResponse(inserted=inserted, failed=len(errors), errors=errors)
+
+
 @router.get("/", response_model=List[ExperienceResponse])
 async def get_experiences(
+    request: Request,
+    response: Response,
     company_name: Optional[str] = None,
     role: Optional[str] = None,
     published_only: bool = True,
+    sort: str = Query("recent", pattern="^(recent|popular)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all experiences with optional filters"""
+    """Get a page of experiences with optional filters.
+
+    The token for the next page is returned in the X-Next-Cursor header.
+    sort=popular orders by bookmark count (served from its index).
+    view=summary or fields=a,b,c returns only those fields and skips reading
+    the large JSON/Text columns.
+    """
     try:
-        query = db.query(Experience)
-        
-        if published_only:
-            query = query.filter(Experience.is_published == True)
+        projection = resolve_fields(view, fields)
         
-        if company_name:
-            query = query.filter(Experience.company_name.ilike(f"%{company_name}%"))
+        # Answer unchanged polls with 304 before touching any rows
+        criteria = [Experience.is_published == True] if published_only else []
+        version = resource_version(
+            request_scope(request),
+            table_state(db, Experience, *criteria),
+            # bookmark_count changes without touching updated_at
+            table_state(db, Bookmark)
+        )
+        not_modified = conditional_response(request, response, version)
+        if not_modified:
+            return not_modified
         
-        if role:
-            query = query.filter(Experience.role.ilike(f"%{role}%"))
+        query = apply_experience_filters(
+            _list_query(db, projection), company_name, role, published_only
+        )
         
-        experiences = query.order_by(Experience.created_at.desc()).all()
+        sort_column = Experience.bookmark_count if sort == "popular" else Experience.created_at
+        experiences, next_cursor = keyset_paginate(
+            query, sort_column, Experience.id, cursor, limit
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         
         # Return empty list if no experiences
         if not experiences:
             return []
         
+        if projection:
+            return _projected_response(response, to_projected_dicts(experiences, projection))
+        
         # Use model_validate for Pydantic v2
         results = []
         for exp in experiences:
             try:
-                response = ExperienceResponse.model_validate(exp, from_attributes=True)
-                
-                if not exp.is_anonymous and exp.user_id:
-                    user = db.query(User).filter(User.id == exp.user_id).first()
-                    if user:
-                        response.user_name = user.full_name
-                
-                results.append(response)
+                results.append(to_experience_response(exp))
             except Exception as e:
                 print(f"Error processing experience {exp.id if exp else 'unknown'}: {e}")
                 import traceback
@@ -81,6 +192,8 @@ async def get_experiences(
                 continue
         
         return results
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_experiences: {e}")
         import traceback
@@ -90,39 +203,152 @@ async def get_experiences(
 
 @router.get("/my-experiences", response_model=List[ExperienceResponse])
 async def get_my_experiences(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get current user's experiences"""
-    experiences = db.query(Experience).filter(
-        Experience.user_id == current_user.id
-    ).order_by(Experience.created_at.desc()).all()
+    """Get a page of the current user's experiences"""
+    projection = resolve_fields(view, fields)
+    query = db.query(Experience)
+    if projection:
+        query = with_projection(query, projection)
+    query = query.filter(Experience.user_id == current_user.id)
+    experiences, next_cursor = keyset_paginate(
+        query, Experience.created_at, Experience.id, cursor, limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    if projection:
+        return _projected_response(response, to_projected_dicts(experiences, projection))
     
     return [ExperienceResponse.model_validate(exp, from_attributes=True) for exp in experiences]
 
 
+@router.get("/search", response_model=List[ExperienceResponse])
+async def search_experiences(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over published experiences, best match first.
+
+    Matches company, role, preparation strategy, rejection reasons and the
+    questions asked.
+    """
+    if not search_index.supported:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available for this database"
+        )
+    
+    hits = search_index.search(db, q, limit=limit, offset=offset)
+    if not hits:
+        return []
+    
+    ids = [experience_id for experience_id, _ in hits]
+    experiences = with_author(db.query(Experience)).filter(
+        Experience.id.in_(ids),
+        Experience.is_published == True
+    ).all()
+    by_id = {exp.id: exp for exp in experiences}
+    
+    return to_experience_responses([by_id[i] for i in ids if i in by_id])
+
+
+@router.get("/facets", response_model=Dict[str, Any])
+@cached(
+    "facets",
+    key=lambda kw: facet_key(kw["company_name"], kw["role"], kw["final_result"], kw["package_band"], kw["limit"])
+)
+async def get_experience_facets(
+    request: Request,
+    response: Response,
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    final_result: Optional[str] = None,
+    package_band: Optional[str] = Query(None, pattern=f"^({'|'.join(BAND_LABELS)})$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """Counts per company, role, final result and package band for a filter set.
+
+    All facets are computed in one statement over published experiences.
+    Responses are cached per normalised filter set, so the same filters in
+    a different order or letter case share one entry.
+    """
+    key = facet_key(company_name, role, final_result, package_band, limit)
+    version = resource_version(
+        f"{request.url.path}?{key}",
+        table_state(db, Experience, Experience.is_published == True)
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
+    
+    total, facets = facet_counts(db, company_name, role, final_result, package_band, limit)
+    return {"total": total, "facets": facets}
+
+
+@router.get("/export")
+async def export_experiences(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    published_only: bool = True
+):
+    """Stream every matching experience as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written as they arrive, so
+    memory use does not grow with the size of the table.
+    """
+    if format == "csv":
+        body = stream_csv(company_name, role, published_only)
+        media_type = "text/csv"
+    else:
+        body = stream_ndjson(company_name, role, published_only)
+        media_type = "application/x-ndjson"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="experiences.{format}"'}
+    )
+
+
 @router.get("/{experience_id}", response_model=ExperienceResponse)
 async def get_experience(
     experience_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Get a specific experience"""
-    experience = db.query(Experience).filter(Experience.id == experience_id).first()
+    experience = with_author(db.query(Experience)).filter(Experience.id == experience_id).first()
     
+    # Checked before the validators, so a stale ETag can't turn a 404 into a 304
     if not experience:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Experience not found"
         )
     
-    # Use model_validate for Pydantic v2
-    response = ExperienceResponse.model_validate(experience, from_attributes=True)
-    if not experience.is_anonymous and experience.user_id:
-        user = db.query(User).filter(User.id == experience.user_id).first()
-        if user:
-            response.user_name = user.full_name
+    version = resource_version(
+        request_scope(request),
+        table_state(db, Experience, Experience.id == experience_id),
+        # bookmark_count changes without touching updated_at
+        (experience.bookmark_count or 0, None)
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
     
-    return response
+    return to_experience_response(experience)
 
 
 @router.put("/{experience_id}", response_model=ExperienceResponse)
@@ -153,12 +379,21 @@ async def update_experience(
             detail="Cannot update approved experience"
         )
     
+    previous_company_id = experience.company_id
     update_data = request.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(experience, field, value)
     
+    if "company_name" in update_data:
+        company = resolve_company(db, experience.company_name)
+        experience.company_id = company.id if company else None
+    
     db.commit()
     db.refresh(experience)
+    tags = experience_tags(experience)
+    if previous_company_id and previous_company_id != experience.company_id:
+        tags.append(company_tag(previous_company_id))
+    invalidate(tags)
     
     return ExperienceResponse.model_validate(experience)
 
@@ -195,7 +430,16 @@ async def bookmark_experience(
         experience_id=experience_id
     )
     db.add(bookmark)
-    db.commit()
+    increment_bookmark_count(db, experience_id, 1)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request inserted the same bookmark first
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already bookmarked"
+        )
     
     return {"message": "Experience bookmarked successfully"}
 
@@ -219,33 +463,51 @@ async def remove_bookmark(
         )
     
     db.delete(bookmark)
+    increment_bookmark_count(db, experience_id, -1)
     db.commit()
     
     return {"message": "Bookmark removed successfully"}
 
 
+@router.get("/bookmarks/state", response_model=Dict[int, bool])
+async def get_bookmark_state(
+    ids: List[int] = Query(..., max_length=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Bookmark state for a batch of experience ids, in one indexed query"""
+    bookmarked = {
+        experience_id for (experience_id,) in db.query(Bookmark.experience_id).filter(
+            Bookmark.user_id == current_user.id,
+            Bookmark.experience_id.in_(ids)
+        )
+    }
+    
+    return {experience_id: experience_id in bookmarked for experience_id in ids}
+
+
 @router.get("/bookmarks/all", response_model=List[ExperienceResponse])
 async def get_bookmarked_experiences(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all bookmarked experiences"""
-    bookmarks = db.query(Bookmark).filter(
-        Bookmark.user_id == current_user.id
-    ).all()
-    
-    experience_ids = [b.experience_id for b in bookmarks]
-    experiences = db.query(Experience).filter(
-        Experience.id.in_(experience_ids)
-    ).all()
+    """Get a page of bookmarked experiences"""
+    projection = resolve_fields(view, fields)
+    query = _list_query(db, projection).join(
+        Bookmark, Bookmark.experience_id == Experience.id
+    ).filter(Bookmark.user_id == current_user.id)
+    experiences, next_cursor = keyset_paginate(
+        query, Experience.created_at, Experience.id, cursor, limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    results = []
-    for exp in experiences:
-        response = ExperienceResponse.model_validate(exp, from_attributes=True)
-        if not exp.is_anonymous and exp.user_id:
-            user = db.query(User).filter(User.id == exp.user_id).first()
-            if user:
-                response.user_name = user.full_name
-        results.append(response)
+    if projection:
+        return _projected_response(response, to_projected_dicts(experiences, projection))
     
-    return results
+    return to_experience_responses(experiences)
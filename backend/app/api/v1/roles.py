@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Query
+from typing import Any, Dict, List
+from app.services.autocomplete import MAX_SUGGESTIONS, role_index
+
+router = APIRouter()
+
+
+@router.get("/autocomplete", response_model=List[Dict[str, Any]])
+async def autocomplete_roles(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(MAX_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS)
+):
+    """Roles starting with prefix, most experiences first.
+
+    Answered from an in-memory prefix index; no database access.
+    """
+    return role_index.suggest(prefix, limit)
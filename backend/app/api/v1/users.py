@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.db.models import User
 from app.api.dependencies import get_current_user
+from app.api.response_cache import experience_tags, invalidate
+from app.services.package_sketches import rebuild_college_sketches
 from app.schemas.user import ProfileUpdateRequest, UserResponse
 
 router = APIRouter()
@@ -39,6 +41,7 @@ async def update_profile(
 ):
     """Update user profile"""
     update_data = request.dict(exclude_unset=True)
+    previous_college = current_user.college_name
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
@@ -47,8 +50,17 @@ async def update_profile(
     current_user.profile_completion_percentage = calculate_profile_completion(current_user)
     current_user.profile_completed = current_user.profile_completion_percentage == 100
     
+    college_changed = current_user.college_name != previous_college
+    if college_changed:
+        # The user's packages move from one college's sketch to the other's
+        db.flush()
+        rebuild_college_sketches(db, previous_college, current_user.college_name)
+    
     db.commit()
     db.refresh(current_user)
+    # College statistics are grouped by profile college
+    if college_changed:
+        invalidate(experience_tags())
     
     return current_user
 
@@ -0,0 +1,193 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+from app.core.config import settings
+
+# Entries are never deleted on writes. Each entry's key embeds the current
+# versions of its tags, so bumping a tag version makes every dependent entry
+# unreachable; stale entries then age out through TTL or LRU eviction.
+_TAG_PREFIX = "tag:"
+
+
+class CacheBackend(ABC):
+    """Key/value store for cached responses plus per-tag version counters"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    def tag_version(self, tag: str) -> int:
+        ...
+
+    @abstractmethod
+    def bump_tag(self, tag: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Make every entry cached under any of `tags` unreachable"""
+        for tag in set(tags):
+            self.bump_tag(tag)
+
+    def versioned_key(self, key: str, tags) -> str:
+        versions = ",".join(f"{tag}={self.tag_version(tag)}" for tag in sorted(set(tags)))
+        return f"{key}|{versions}"
+
+
+class NullCache(CacheBackend):
+    """Caching switched off: every lookup misses"""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        pass
+
+    def tag_version(self, tag: str) -> int:
+        return 0
+
+    def bump_tag(self, tag: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache with a TTL on every entry.
+
+    Tag invalidations only reach the process that made the write, so this is
+    for single-worker deployments; other workers would serve stale entries
+    until their TTL runs out.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_version(self, tag: str) -> int:
+        return self._tags.get(tag, 0)
+
+    def bump_tag(self, tag: str) -> None:
+        with self._lock:
+            self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """Cache in a shared SQLite file, so every worker process sees the same
+    entries and tag versions. Values are stored as JSON.
+    """
+
+    # Expired rows are swept after this many writes
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit: every statement is its own short transaction
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":")), time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+
+    def tag_version(self, tag: str) -> int:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ?", (_TAG_PREFIX + tag,)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def bump_tag(self, tag: str) -> None:
+        # Tag versions never expire (expires_at NULL is skipped by the sweep)
+        self._connection().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, '1', NULL) "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (_TAG_PREFIX + tag,)
+        )
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache_entries")
+
+
+def create_cache() -> CacheBackend:
+    """Build the backend selected by CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES)
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCache(settings.CACHE_SQLITE_PATH)
+    return NullCache()
+
+
+cache = create_cache()
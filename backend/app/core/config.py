@@ -21,10 +21,34 @@ class Settings(BaseSettings):
     
     # AI
     OLLAMA_BASE_URL: str = "http://localhost:11434"
+    AI_GUIDE_RETRY_SECONDS: int = 300  # Template guides (model unreachable) are regenerated after this long
+    AI_GUIDE_REGENERATION_LEASE_SECONDS: int = 120  # A worker's claim on regenerating a stale guide expires after this
+    AI_TIPS_LATENCY_BUDGET_SECONDS: float = 10.0  # Longest a request waits for the model before using fallback tips
+    KEYWORD_TAXONOMY_FILE: Optional[str] = None  # JSON {taxonomy: {label: [phrases]}} merged over the built-in keywords
     
     # Admin
     ADMIN_PASSWORD: str
     
+    # Background jobs
+    BOOKMARK_RECONCILE_INTERVAL_SECONDS: int = 3600  # 0 disables the job
+    AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS: int = 300  # Reload autocomplete names (picks up other workers' approvals); 0 disables
+    
+    # Bulk import
+    BULK_IMPORT_MAX_ROWS: int = 10000
+    BULK_IMPORT_BATCH_SIZE: int = 1000
+    
+    # Analytics snapshots
+    # Enable in exactly one process (the only worker, or one dedicated instance); until then analytics are computed live
+    ANALYTICS_SNAPSHOT_WORKER: bool = False  # Refresh snapshots in this process
+    ANALYTICS_SNAPSHOT_INTERVAL_SECONDS: int = 30  # Change check interval; 0 disables the scheduler
+    ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS: int = 600  # Snapshots not checked for this long are ignored
+    
+    # Response cache
+    CACHE_BACKEND: str = "sqlite"  # "sqlite" (shared by workers on one host), "memory" (single-worker only) or "none"
+    CACHE_SQLITE_PATH: str = "cache.db"
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 1024
+    
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
     
@@ -1,8 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, JSON, Index, UniqueConstraint
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# SQLite keeps timestamps as text. Bound datetimes are written in the same
+# whole-second form CURRENT_TIMESTAMP defaults use, so stored and bound values
+# compare correctly and range/seek predicates can use the bare indexed column.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -13,8 +22,8 @@ class User(Base):
     hashed_password = Column(String)
     is_verified = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
     
     # Profile fields
     linkedin_id = Column(String, nullable=True)
@@ -31,10 +40,21 @@ class User(Base):
 
 class Experience(Base):
     __tablename__ = "experiences"
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id)
+        Index("ix_experiences_created_at_id", "created_at", "id"),
+        # Popularity-ranked feed (sort=popular)
+        Index("ix_experiences_published_popularity", "is_published", "bookmark_count", "id"),
+        # Time-bucketed trend series (/analytics/timeseries)
+        Index("ix_experiences_published_created_at", "is_published", "created_at"),
+        # Incremental refresh of the analytics column store
+        Index("ix_experiences_updated_at", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     company_name = Column(String, nullable=False, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True, index=True)
     role = Column(String, nullable=False, index=True)
     package_offered = Column(Float, nullable=True)
     
@@ -45,26 +65,58 @@ class Experience(Base):
     resources_followed = Column(JSON, nullable=True)  # List of resources
     rejection_reasons = Column(Text, nullable=True)
     final_result = Column(String, nullable=False)  # "Selected" or "Rejected"
+    bookmark_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained on bookmark/unbookmark
     
     # Metadata
     is_anonymous = Column(Boolean, default=False)
     is_approved = Column(Boolean, default=False)
     is_published = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="experiences")
+    company = relationship("Company", back_populates="experiences")
     bookmarks = relationship("Bookmark", back_populates="experience")
 
 
+class Company(Base):
+    __tablename__ = "companies"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)  # Display name (first spelling seen)
+    normalized_name = Column(String, unique=True, index=True, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+    
+    # Relationships
+    aliases = relationship("CompanyAlias", back_populates="company")
+    experiences = relationship("Experience", back_populates="company")
+
+
+class CompanyAlias(Base):
+    __tablename__ = "company_aliases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
+    alias = Column(String, nullable=False)
+    normalized_alias = Column(String, unique=True, index=True, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+    
+    # Relationships
+    company = relationship("Company", back_populates="aliases")
+
+
 class Bookmark(Base):
     __tablename__ = "bookmarks"
+    __table_args__ = (
+        # One bookmark per user and experience; also serves per-user state lookups
+        Index("ix_bookmarks_user_experience", "user_id", "experience_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     experience_id = Column(Integer, ForeignKey("experiences.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="bookmarks")
@@ -79,7 +131,7 @@ class Admin(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(String, default="moderator")  # "super_admin" or "moderator"
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
 
 class AuditLog(Base):
@@ -91,4 +143,139 @@ class AuditLog(Base):
     entity_type = Column(String, nullable=False)  # "experience", "user"
     entity_id = Column(Integer, nullable=False)
     details = Column(JSON, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+
+
+# Published-experience totals per (company, role, result, month)
+class AnalyticsRollup(Base):
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        UniqueConstraint("company_id", "role", "final_result", "month", name="uq_analytics_rollups_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True, index=True)
+    role = Column(String, nullable=False, index=True)
+    final_result = Column(String, nullable=False)
+    month = Column(String, nullable=False)  # "YYYY-MM" of created_at
+    experience_count = Column(Integer, nullable=False, default=0)
+    package_sum = Column(Float, nullable=False, default=0)
+    package_count = Column(Integer, nullable=False, default=0)  # Experiences with a disclosed package
+
+
+# Published-experience counts of free-form values (resources, difficulty levels, ...)
+class AnalyticsCounter(Base):
+    __tablename__ = "analytics_counters"
+    __table_args__ = (
+        UniqueConstraint("kind", "key", name="uq_analytics_counters_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # "resource", "difficulty", "rejection_reason"
+    key = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Cluster of near-duplicate interview questions ("Reverse a linked list" ~ "reverse a linked-list.")
+class QuestionCluster(Base):
+    __tablename__ = "question_clusters"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    canonical_text = Column(Text, nullable=False)  # First spelling seen
+    normalized_text = Column(Text, nullable=False, index=True)
+    signature = Column(JSON, nullable=False)  # MinHash signature of the canonical text
+    created_at = Column(Timestamp, server_default=func.now())
+
+
+# LSH band buckets pointing at clusters; a shared bucket marks a near-duplicate candidate
+class QuestionLshBucket(Base):
+    __tablename__ = "question_lsh_buckets"
+    __table_args__ = (
+        Index("ix_question_lsh_buckets_band_bucket", "band", "bucket"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    band = Column(Integer, nullable=False)
+    bucket = Column(String, nullable=False)
+    cluster_id = Column(Integer, ForeignKey("question_clusters.id"), nullable=False, index=True)
+
+
+# Clusters contributed by each published experience (lets unpublishing undo exactly)
+class ExperienceQuestion(Base):
+    __tablename__ = "experience_questions"
+    __table_args__ = (
+        UniqueConstraint("experience_id", "cluster_id", name="uq_experience_questions_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    experience_id = Column(Integer, ForeignKey("experiences.id"), nullable=False, index=True)
+    cluster_id = Column(Integer, ForeignKey("question_clusters.id"), nullable=False)
+
+
+# Number of published experiences per company that asked a question cluster
+class CompanyQuestionCount(Base):
+    __tablename__ = "company_question_counts"
+    __table_args__ = (
+        UniqueConstraint("company_id", "cluster_id", name="uq_company_question_counts_key"),
+        Index("ix_company_question_counts_company_count", "company_id", "count"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
+    cluster_id = Column(Integer, ForeignKey("question_clusters.id"), nullable=False, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Mergeable KLL quantile sketch of disclosed packages per company, role or college
+class PackageSketch(Base):
+    __tablename__ = "package_sketches"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_package_sketches_scope_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)  # "company", "role", "college"
+    key = Column(String, nullable=False)  # Company id, role or college name
+    sketch = Column(JSON, nullable=False)
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+
+# Frequency-ranked rounds, questions and skills from one company's published experiences
+class CompanyProfile(Base):
+    __tablename__ = "company_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    company_id = Column(Integer, ForeignKey("companies.id"), unique=True, nullable=False)
+    experience_count = Column(Integer, nullable=False, default=0)
+    # [[value, experiences mentioning it], ...], most frequent first, ties alphabetical
+    rounds = Column(JSON, nullable=False, default=list)
+    skills = Column(JSON, nullable=False, default=list)
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
+
+
+# Precomputed analytics response, refreshed in the background when published data changes
+class AnalyticsSnapshot(Base):
+    __tablename__ = "analytics_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)  # "trends", "company-stats", "college-stats"
+    payload = Column(JSON, nullable=False)
+    source_version = Column(String, nullable=False)  # Published-data version the payload was computed from
+    computed_at = Column(Timestamp, nullable=False)
+    checked_at = Column(Timestamp, nullable=False)  # Last time the scheduler confirmed it current
+
+
+# Generated preparation guide per company, reused until its contributing experiences change
+class PreparationGuide(Base):
+    __tablename__ = "preparation_guides"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    company_key = Column(String, unique=True, nullable=False)  # Registry normalized name
+    experience_hash = Column(String, nullable=False)  # SHA-1 of the contributing experience ids
+    guide = Column(Text, nullable=False)
+    tips = Column(JSON, nullable=False)  # Tips parsed from the guide
+    from_model = Column(Boolean, nullable=False, default=True)  # False when the model was unreachable and the template was used
+    generated_at = Column(Timestamp, nullable=False)
+    regenerating_since = Column(Timestamp, nullable=True)  # Claim held by the worker regenerating it
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
@@ -36,6 +36,29 @@ class ExperienceUpdateRequest(BaseModel):
     is_anonymous: Optional[bool] = None
 
 
+class BulkImportRowError(BaseModel):
+    row: int  # Zero-based position in a JSON array; one-based line number in an NDJSON body
+    errors: List[Dict[str, Any]]
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportRowError]
+
+
+class ExperienceSummaryResponse(BaseModel):
+    """Card-sized projection returned by list endpoints with view=summary"""
+    id: int
+    company_name: str
+    role: str
+    package_offered: Optional[float]
+    final_result: str
+    is_anonymous: bool
+    user_name: Optional[str] = None
+    created_at: datetime
+
+
 class ExperienceResponse(BaseModel):
     id: int
     company_name: str
@@ -50,6 +73,7 @@ class ExperienceResponse(BaseModel):
     is_anonymous: bool
     is_approved: bool
     is_published: bool
+    bookmark_count: int = 0
     user_id: Optional[int] = None
     user_name: Optional[str] = None
     created_at: datetime
@@ -1,5 +1,5 @@
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.core.config import settings
 from app.db.models import Experience
 
@@ -53,9 +53,14 @@ class AIService:
         self,
         company_name: str,
         role: str,
-        experiences: List[Experience]
-    ) -> str:
-        """Generate a preparation guide using AI"""
+        experiences: List[Experience],
+        fallback: bool = True
+    ) -> Optional[str]:
+        """Generate a preparation guide using AI.
+
+        When the model can't be reached, returns the template guide, or
+        None if fallback is False.
+        """
         # Prepare context from experiences
         context = f"Company: {company_name}, Role: {role}\n\n"
         
@@ -95,11 +100,11 @@ class AIService:
                 if response.status_code == 200:
                     result = response.json()
                     return result.get("response", "Unable to generate guide at this time.")
-                else:
-                    return self._generate_fallback_guide(company_name, role, experiences)
         
         except Exception:
-            return self._generate_fallback_guide(company_name, role, experiences)
+            pass
+        
+        return self._generate_fallback_guide(company_name, role, experiences) if fallback else None
     
     def _generate_fallback_guide(
         self,
@@ -0,0 +1,138 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.db.models import AnalyticsCounter, AnalyticsRollup, Company, Experience, User
+from app.services import question_bank
+
+EMPTY_COMPANY_STATS = {
+    "total_experiences": 0,
+    "companies": [],
+    "roles": [],
+    "selection_rate": 0,
+    "average_package": 0
+}
+
+# Rollup rows are summed, so reads cost O(companies x roles x months), not O(experiences)
+ROLLUP_TOTAL = func.sum(AnalyticsRollup.experience_count)
+
+# (college, published experiences, selected)
+CollegeRow = Tuple[str, int, int]
+
+
+def rollup_summary(db: Session, criteria: List[Any]) -> Tuple[int, float, float]:
+    """(total, selection rate %, average package) from the rollups in one query"""
+    total, selected, package_sum, package_count = db.query(
+        ROLLUP_TOTAL,
+        func.sum(case((AnalyticsRollup.final_result == "Selected", AnalyticsRollup.experience_count), else_=0)),
+        func.sum(AnalyticsRollup.package_sum),
+        func.sum(AnalyticsRollup.package_count)
+    ).filter(*criteria).one()
+
+    if not total:
+        return 0, 0, 0
+    avg_package = package_sum / package_count if package_count else 0
+    return total, round(selected / total * 100, 2), round(avg_package, 2)
+
+
+def top_rollup_counts(db: Session, column, criteria: List[Any], limit: int = 10) -> Dict[str, int]:
+    """Top values of `column` by experience count, grouped over the rollups"""
+    rows = db.query(column, ROLLUP_TOTAL).outerjoin(
+        Company, Company.id == AnalyticsRollup.company_id
+    ).filter(*criteria).group_by(column).having(ROLLUP_TOTAL > 0).order_by(
+        ROLLUP_TOTAL.desc(), column
+    ).limit(limit).all()
+
+    return {label: total for label, total in rows}
+
+
+def top_counter(db: Session, kind: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """Most frequent values of one trends counter"""
+    query = db.query(AnalyticsCounter.key, AnalyticsCounter.count).filter(
+        AnalyticsCounter.kind == kind,
+        AnalyticsCounter.count > 0
+    ).order_by(AnalyticsCounter.count.desc(), AnalyticsCounter.key)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def company_stats(db: Session, company: Optional[Company] = None) -> Dict[str, Any]:
+    """Statistics for one registry company, or for all companies"""
+    criteria = [AnalyticsRollup.company_id == company.id] if company else []
+
+    total, selection_rate, avg_package = rollup_summary(db, criteria)
+    if not total:
+        return EMPTY_COMPANY_STATS
+
+    # Near-duplicate phrasings are counted together via the question bank
+    top_questions = question_bank.top_questions(db, company.id if company else None, limit=10)
+
+    return {
+        "total_experiences": total,
+        "companies": top_rollup_counts(db, Company.name, criteria),
+        "roles": top_rollup_counts(db, AnalyticsRollup.role, criteria),
+        "selection_rate": selection_rate,
+        "average_package": avg_package,
+        "top_questions": [{"question": q, "count": c} for q, c in top_questions]
+    }
+
+
+def trends(db: Session) -> Dict[str, Any]:
+    """Placement trends over all published experiences"""
+    top_resources = top_counter(db, "resource", limit=10)
+    rejection_reasons = top_counter(db, "rejection_reason")
+    difficulty_dist = top_counter(db, "difficulty")
+    total = db.query(ROLLUP_TOTAL).scalar() or 0
+
+    return {
+        "top_resources": [{"resource": r, "count": c} for r, c in top_resources],
+        "rejection_reasons_count": sum(c for _, c in rejection_reasons),
+        "difficulty_distribution": dict(difficulty_dist),
+        "total_experiences": total
+    }
+
+
+def college_rows(
+    db: Session,
+    sort: str = "volume",
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> List[CollegeRow]:
+    """Per-college totals in one join and GROUP BY, largest (or most successful) first"""
+    total = func.count(Experience.id)
+    selected = func.sum(case((Experience.final_result == "Selected", 1), else_=0))
+    selection_rate = selected * 100.0 / total
+
+    query = db.query(User.college_name, total, selected).join(
+        Experience, Experience.user_id == User.id
+    ).filter(
+        User.college_name.isnot(None),
+        User.college_name != "",
+        Experience.is_published == True
+    ).group_by(User.college_name)
+
+    if sort == "selection_rate":
+        query = query.order_by(selection_rate.desc(), total.desc(), User.college_name)
+    else:
+        query = query.order_by(total.desc(), User.college_name)
+
+    return [tuple(row) for row in query.limit(limit).offset(offset)]
+
+
+def page_college_rows(rows: List[CollegeRow], sort: str, limit: int, offset: int) -> List[CollegeRow]:
+    """Order and page precomputed college rows the same way college_rows() does in SQL"""
+    if sort == "selection_rate":
+        key = lambda row: (-(row[2] * 100.0 / row[1]), -row[1], row[0])
+    else:
+        key = lambda row: (-row[1], row[0])
+    return sorted(rows, key=key)[offset:offset + limit]
+
+
+def college_stats(rows: List[CollegeRow]) -> Dict[str, Dict[str, Any]]:
+    return {
+        college: {
+            "total_experiences": college_total,
+            "selection_rate": round((college_selected / college_total * 100), 2)
+        }
+        for college, college_total, college_selected in rows
+    }
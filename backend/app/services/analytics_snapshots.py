@@ -0,0 +1,122 @@
+import asyncio
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import AnalyticsSnapshot, Experience, User
+from app.api.conditional import resource_version, table_state
+from app.services import analytics_service
+from app.services.jobs import run_job
+
+# After a change signal, wait this long so a burst of approvals costs one refresh
+SIGNAL_DEBOUNCE_SECONDS = 1
+
+# Snapshot name -> payload builder. College rows are stored unpaged and in
+# volume order; the endpoint re-sorts and pages them.
+SNAPSHOTS: Dict[str, Callable[[Session], Any]] = {
+    "trends": analytics_service.trends,
+    "company-stats": analytics_service.company_stats,
+    "college-stats": analytics_service.college_rows,
+}
+
+_wakeup: Optional[asyncio.Event] = None
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def source_version(db: Session) -> str:
+    """Version of everything the snapshots are computed from"""
+    return resource_version(
+        "analytics-snapshots",
+        table_state(db, Experience, Experience.is_published == True),
+        table_state(db, User, User.college_name.isnot(None))
+    ).etag
+
+
+def refresh_snapshots(db: Session, force: bool = False) -> int:
+    """Recompute snapshots whose source data changed. Returns how many were rebuilt."""
+    version = source_version(db)
+    now = datetime.now(timezone.utc)
+    existing = {snapshot.name: snapshot for snapshot in db.query(AnalyticsSnapshot)}
+
+    refreshed = 0
+    for name, build in SNAPSHOTS.items():
+        snapshot = existing.get(name)
+        if snapshot is not None and snapshot.source_version == version and not force:
+            snapshot.checked_at = now
+            continue
+
+        payload = build(db)
+        if snapshot is None:
+            db.add(AnalyticsSnapshot(
+                name=name,
+                payload=payload,
+                source_version=version,
+                computed_at=now,
+                checked_at=now
+            ))
+        else:
+            snapshot.payload = payload
+            snapshot.source_version = version
+            snapshot.computed_at = now
+            snapshot.checked_at = now
+        refreshed += 1
+
+    db.commit()
+    return refreshed
+
+
+def get_snapshot(db: Session, name: str) -> Optional[AnalyticsSnapshot]:
+    """Latest snapshot, or None when missing or no longer maintained"""
+    snapshot = db.query(AnalyticsSnapshot).filter(AnalyticsSnapshot.name == name).first()
+    if snapshot is None:
+        return None
+    unchecked_for = (datetime.now(timezone.utc) - _utc(snapshot.checked_at)).total_seconds()
+    if unchecked_for > settings.ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS:
+        return None
+    return snapshot
+
+
+def snapshot_time(snapshot: AnalyticsSnapshot) -> datetime:
+    return _utc(snapshot.computed_at)
+
+
+def snapshot_age(snapshot: AnalyticsSnapshot) -> int:
+    """Seconds since the snapshot's data was computed"""
+    return max(0, int((datetime.now(timezone.utc) - snapshot_time(snapshot)).total_seconds()))
+
+
+def request_refresh() -> None:
+    """Signal that published data changed; wakes the scheduler if it runs in this process"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def run_snapshot_scheduler(interval_seconds: int) -> None:
+    """Refresh snapshots now, then on every change signal or interval_seconds, until cancelled"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    signalled = False
+    while True:
+        try:
+            # A signal may report changes the version check can't see (e.g. a company rename)
+            refreshed = await asyncio.to_thread(run_job, lambda db: refresh_snapshots(db, force=signalled))
+            if refreshed:
+                print(f"Analytics snapshots refreshed: {refreshed}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"ERROR refreshing analytics snapshots: {e}")
+            traceback.print_exc()
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=interval_seconds)
+            await asyncio.sleep(SIGNAL_DEBOUNCE_SECONDS)
+            signalled = True
+        except asyncio.TimeoutError:
+            signalled = False
+        _wakeup.clear()
@@ -0,0 +1,189 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from app.db.models import Company, Experience
+
+# Names cached per trie node, and so the most one lookup can return
+MAX_SUGGESTIONS = 10
+
+# (weight, key)
+Entry = Tuple[int, str]
+
+# Session.info key holding index changes waiting for the transaction to commit
+PENDING_KEY = "autocomplete_pending"
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+def _ranked(entries: Iterable[Entry]) -> List[Entry]:
+    # Heaviest first; ties alphabetical so suggestions are stable
+    return sorted(entries, key=lambda entry: (-entry[0], entry[1]))[:MAX_SUGGESTIONS]
+
+
+class _Node:
+    __slots__ = ("children", "key", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.key: Optional[str] = None  # Set when a name ends at this node
+        self.top: List[Entry] = []
+
+
+class PrefixIndex:
+    """Trie of names weighted by published experience count.
+
+    Every node caches the MAX_SUGGESTIONS heaviest names below it, so a
+    lookup walks the prefix and returns that list: O(prefix length), with
+    no database access. add() updates one name and the cached lists along
+    its path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._weights: Dict[str, int] = {}
+        self._names: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def _top(self, node: _Node, weights: Dict[str, int]) -> List[Entry]:
+        if node.key is None and len(node.children) == 1:
+            # Inside a single-branch run the list is the child's; lists are replaced, never mutated
+            return next(iter(node.children.values())).top
+        entries = [entry for child in node.children.values() for entry in child.top]
+        if node.key is not None:
+            entries.append((weights[node.key], node.key))
+        return _ranked(entries)
+
+    def load(self, entries: Iterable[Tuple[str, int]]) -> None:
+        """Replace the contents with (name, weight) pairs.
+
+        Names equal up to case and spacing are combined under the first
+        spelling given.
+        """
+        weights: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        for name, weight in entries:
+            key = _normalize(name)
+            if key and weight > 0:
+                weights[key] = weights.get(key, 0) + weight
+                names.setdefault(key, name.strip())
+
+        root = _Node()
+        for key in weights:
+            node = root
+            for char in key:
+                node = node.children.setdefault(char, _Node())
+            node.key = key
+
+        def fill(node: _Node) -> None:
+            for child in node.children.values():
+                fill(child)
+            node.top = self._top(node, weights)
+
+        fill(root)
+        # Built aside and swapped in, so lookups never see a partial trie
+        with self._lock:
+            self._root, self._weights, self._names = root, weights, names
+
+    def add(self, name: Optional[str], delta: int) -> None:
+        """Change a name's weight; it drops out of suggestions at zero"""
+        key = _normalize(name)
+        if not key:
+            return
+
+        with self._lock:
+            weight = self._weights.get(key, 0) + delta
+            if weight > 0:
+                self._weights[key] = weight
+                self._names.setdefault(key, name.strip())
+            else:
+                self._weights.pop(key, None)
+                self._names.pop(key, None)
+
+            path = [self._root]
+            for char in key:
+                path.append(path[-1].children.setdefault(char, _Node()))
+            path[-1].key = key if weight > 0 else None
+            for node in reversed(path):
+                node.top = self._top(node, self._weights)
+
+    def suggest(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[Dict[str, Any]]:
+        """Heaviest names starting with prefix (case-insensitive)"""
+        with self._lock:
+            node = self._root
+            for char in _normalize(prefix):
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [
+                {"name": self._names[key], "experience_count": weight}
+                for weight, key in node.top[:limit]
+            ]
+
+
+company_index = PrefixIndex()
+role_index = PrefixIndex()
+
+
+def _company_weights(db: Session) -> List[Tuple[str, int]]:
+    total = func.count(Experience.id)
+    return db.query(Company.name, total).join(
+        Experience, Experience.company_id == Company.id
+    ).filter(Experience.is_published == True).group_by(Company.id, Company.name).all()
+
+
+def load_companies(db: Session) -> None:
+    """(Re)load company names from the registry, weighted by published experiences"""
+    company_index.load(_company_weights(db))
+
+
+def rebuild_autocomplete(db: Session) -> int:
+    """Reload both indexes from published experiences. Returns the number of names."""
+    load_companies(db)
+    total = func.count(Experience.id)
+    # Most common spelling first, so it becomes the displayed one
+    role_index.load(db.query(Experience.role, total).filter(
+        Experience.is_published == True
+    ).group_by(Experience.role).order_by(total.desc(), Experience.role))
+    return len(company_index) + len(role_index)
+
+
+def _on_commit(db: Session, change: Callable[[], None]) -> None:
+    # The indexes are shared by every request, so they only see committed data
+    db.info.setdefault(PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        # A savepoint was released; the outer transaction can still roll back
+        return
+    for change in session.info.pop(PENDING_KEY, []):
+        change()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction) -> None:
+    # Rolled back or closed without committing; a savepoint ending leaves the outer changes queued
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
+
+
+def apply_experience(db: Session, experience: Experience, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one experience's weight once db commits"""
+    company_name = experience.company.name if experience.company is not None else None
+    role = experience.role
+    if company_name is not None:
+        _on_commit(db, lambda: company_index.add(company_name, sign))
+    _on_commit(db, lambda: role_index.add(role, sign))
+
+
+def reload_companies(db: Session) -> None:
+    """Reload company names as db's transaction sees them, once it commits"""
+    weights = _company_weights(db)
+    _on_commit(db, lambda: company_index.load(weights))
@@ -0,0 +1,34 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.db.models import Bookmark, Experience
+
+
+def increment_bookmark_count(db: Session, experience_id: int, delta: int) -> None:
+    """Atomically adjust the denormalized counter (joins the caller's transaction)"""
+    new_count = Experience.bookmark_count + delta
+    db.query(Experience).filter(Experience.id == experience_id).update(
+        {
+            Experience.bookmark_count: case((new_count < 0, 0), else_=new_count),
+            # Not an edit: analytics ETags, snapshots and the column store watch updated_at
+            Experience.updated_at: Experience.updated_at,
+        },
+        synchronize_session=False
+    )
+
+
+def reconcile_bookmark_counts(db: Session) -> int:
+    """Recompute bookmark_count from the bookmarks table, fixing any drift.
+
+    Only rows whose stored counter disagrees are written. Returns how many
+    experiences were corrected.
+    """
+    actual = select(func.count(Bookmark.id)).where(
+        Bookmark.experience_id == Experience.id
+    ).scalar_subquery()
+
+    corrected = db.query(Experience).filter(Experience.bookmark_count != actual).update(
+        {Experience.bookmark_count: actual},
+        synchronize_session=False
+    )
+    db.commit()
+    return corrected
@@ -0,0 +1,87 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.db.models import Experience
+from app.schemas.experience import ExperienceCreateRequest
+from app.services.company_registry import normalize_company_name, resolve_company
+
+
+def parse_records(body: bytes, ndjson: bool) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    """Split a request body into (row, raw record) pairs.
+
+    Rows are zero-based array positions for a JSON body and one-based line
+    numbers for NDJSON, so errors point at the uploader's own lines; blank
+    lines are skipped but still counted. Returns (records, errors); an
+    NDJSON line that is not valid JSON becomes a row error instead of
+    failing the whole upload. A JSON body must be an array.
+    """
+    text = body.decode("utf-8")
+    if not ndjson:
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of experiences")
+        return list(enumerate(records)), []
+
+    records, errors = [], []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append((line_number, json.loads(line)))
+        except json.JSONDecodeError as e:
+            errors.append({"row": line_number, "errors": [{"type": "json_invalid", "msg": str(e)}]})
+            records.append((line_number, None))
+    return records, errors
+
+
+def validate_records(
+    records: List[Tuple[int, Any]],
+    parse_errors: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, ExperienceCreateRequest]], List[Dict[str, Any]]]:
+    """Validate every record before anything is written"""
+    valid, errors = [], list(parse_errors)
+    failed_rows = {error["row"] for error in parse_errors}
+
+    for row, record in records:
+        if row in failed_rows:
+            continue
+        try:
+            valid.append((row, ExperienceCreateRequest.model_validate(record)))
+        except ValidationError as e:
+            errors.append({"row": row, "errors": json.loads(e.json(include_url=False))})
+
+    errors.sort(key=lambda error: error["row"])
+    return valid, errors
+
+
+def insert_experiences(
+    db: Session,
+    user_id: int,
+    experiences: List[ExperienceCreateRequest],
+    batch_size: int
+) -> int:
+    """Insert validated experiences with executemany batches in one transaction"""
+    company_ids: Dict[str, Optional[int]] = {}
+    rows = []
+    for experience in experiences:
+        key = normalize_company_name(experience.company_name)
+        if key not in company_ids:
+            company = resolve_company(db, experience.company_name)
+            company_ids[key] = company.id if company else None
+
+        row = experience.model_dump()
+        row["user_id"] = user_id
+        row["company_id"] = company_ids[key]
+        rows.append(row)
+
+    try:
+        for start in range(0, len(rows), batch_size):
+            db.execute(insert(Experience), rows[start:start + batch_size])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return len(rows)
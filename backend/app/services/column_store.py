@@ -0,0 +1,229 @@
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models import Company, Experience
+
+GROUP_KEYS = ("company", "role", "month", "final_result")
+
+# Columns held in memory; large JSON/Text columns are never read
+_LOAD_COLUMNS = (
+    Experience.id,
+    Experience.company_id,
+    Experience.role,
+    Experience.final_result,
+    Experience.package_offered,
+    Experience.created_at,
+    Experience.is_published,
+)
+
+_NO_COMPANY = -1
+_EPOCH = np.datetime64(0, "s")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # numpy datetime64 has no time zone; normalise to naive UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class _Dictionary:
+    """Dictionary encoding for a string column: value <-> small integer code"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        value = value or ""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value: str) -> int:
+        return self._codes.get(value, -1)
+
+    def matching(self, substring: str) -> np.ndarray:
+        """Codes of values containing substring, case-insensitively (like ILIKE %x%)"""
+        needle = substring.lower()
+        return np.array([code for code, value in enumerate(self.values) if needle in value.lower()], dtype=np.int32)
+
+
+class ColumnStore:
+    """In-memory columnar copy of the experience fields analytics group and filter on.
+
+    Each column is a NumPy array ordered by experience id. refresh() appends
+    rows past the highest loaded id and patches rows whose updated_at moved,
+    so after the first load it reads only what changed. Aggregations are
+    vectorised (bincount/lexsort) instead of looping over ORM objects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._roles = _Dictionary()
+        self._results = _Dictionary()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.ids = np.empty(0, dtype=np.int64)
+        self.company_ids = np.empty(0, dtype=np.int64)
+        self.role_codes = np.empty(0, dtype=np.int32)
+        self.result_codes = np.empty(0, dtype=np.int32)
+        self.packages = np.empty(0, dtype=np.float64)
+        self.created_at = np.empty(0, dtype="datetime64[s]")
+        self.published = np.empty(0, dtype=bool)
+        self.max_id = 0
+        self.max_updated_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _columns(self, rows: List[Tuple]) -> Dict[str, np.ndarray]:
+        ids, company_ids, roles, results, packages, created_at, published = zip(*rows)
+        return {
+            "ids": np.array(ids, dtype=np.int64),
+            "company_ids": np.array([cid if cid is not None else _NO_COMPANY for cid in company_ids], dtype=np.int64),
+            "role_codes": np.array([self._roles.encode(role) for role in roles], dtype=np.int32),
+            "result_codes": np.array([self._results.encode(result) for result in results], dtype=np.int32),
+            # Zero packages mean "not disclosed", as do NULLs
+            "packages": np.array([package or np.nan for package in packages], dtype=np.float64),
+            "created_at": np.array([_naive_utc(value) or _EPOCH for value in created_at], dtype="datetime64[s]"),
+            "published": np.array([bool(value) for value in published], dtype=bool),
+        }
+
+    def _append(self, rows: List[Tuple]) -> None:
+        for name, values in self._columns(rows).items():
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+
+    def _patch(self, rows: List[Tuple]) -> None:
+        columns = self._columns(rows)
+        positions = np.searchsorted(self.ids, columns["ids"])
+        for name, values in columns.items():
+            getattr(self, name)[positions] = values
+
+    def refresh(self, db: Session) -> None:
+        """Bring the arrays up to date with the experiences table.
+
+        Reads rows past the highest loaded id (a primary-key seek) plus rows
+        whose updated_at reached the last watermark (a seek on
+        ix_experiences_updated_at). With no changes that is one COUNT/MAX
+        query and two seeks returning nothing.
+        """
+        count, max_id, max_updated_at = db.query(
+            func.count(Experience.id), func.max(Experience.id), func.max(Experience.updated_at)
+        ).one()
+
+        with self._lock:
+            if count < len(self):
+                # Rows were deleted; ids can't tell which, so start over
+                self._clear()
+
+            query = db.query(*_LOAD_COLUMNS)
+            changed_rows = []
+            if len(self):
+                if self.max_updated_at is not None:
+                    # >= because updated_at has whole-second precision on SQLite; rows
+                    # stamped in the watermark's second are read again
+                    updated = Experience.updated_at >= self.max_updated_at
+                else:
+                    # Nothing had been updated at the last refresh
+                    updated = Experience.updated_at.isnot(None)
+                changed_rows = query.filter(Experience.id <= self.max_id, updated).all()
+            new_rows = query.filter(Experience.id > self.max_id).order_by(Experience.id).all()
+
+            if changed_rows:
+                self._patch(changed_rows)
+            if new_rows:
+                self._append(new_rows)
+
+            self.max_id = max(self.max_id, max_id or 0)
+            self.max_updated_at = max_updated_at or self.max_updated_at
+
+            if len(self) < count:
+                # A transaction committed an id below one already loaded
+                self._clear()
+                rows = query.order_by(Experience.id).all()
+                if rows:
+                    self._append(rows)
+                self.max_id = max_id or 0
+                self.max_updated_at = max_updated_at
+
+    def aggregate(
+        self,
+        db: Session,
+        group_by: str,
+        company_id: Optional[int] = None,
+        role: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Per-group totals, selection rate and package average/median over published experiences"""
+        with self._lock:
+            mask = self.published.copy()
+            if company_id is not None:
+                mask &= self.company_ids == company_id
+            if role:
+                mask &= np.isin(self.role_codes, self._roles.matching(role))
+
+            selected = self.result_codes[mask] == self._results.code("Selected")
+            packages = self.packages[mask]
+            labels, codes = self._group_codes(group_by, mask)
+
+        if group_by == "company":
+            names = dict(db.query(Company.id, Company.name).filter(Company.id.in_(labels)))
+            labels = [names.get(company_id) for company_id in labels]
+
+        groups = len(labels)
+        totals = np.bincount(codes, minlength=groups)
+        selected_counts = np.bincount(codes, weights=selected, minlength=groups)
+
+        disclosed = ~np.isnan(packages)
+        package_counts = np.bincount(codes[disclosed], minlength=groups)
+        package_sums = np.bincount(codes[disclosed], weights=packages[disclosed], minlength=groups)
+        medians = self._group_medians(codes[disclosed], packages[disclosed], package_counts)
+
+        # Months read chronologically; other groups largest first
+        order = np.arange(groups) if group_by == "month" else np.argsort(-totals, kind="stable")
+        results = []
+        for index in order:
+            if not totals[index]:
+                continue
+            results.append({
+                "group": labels[index],
+                "total_experiences": int(totals[index]),
+                "selection_rate": round(float(selected_counts[index] / totals[index] * 100), 2),
+                "average_package": round(float(package_sums[index] / package_counts[index]), 2) if package_counts[index] else 0,
+                "median_package": round(float(medians[index]), 2) if package_counts[index] else None
+            })
+        return results[:limit] if limit else results
+
+    def _group_codes(self, group_by: str, mask: np.ndarray) -> Tuple[List[Any], np.ndarray]:
+        """(group keys, dense group code per masked row); company keys are ids"""
+        if group_by == "company":
+            keys, codes = np.unique(self.company_ids[mask], return_inverse=True)
+            return keys.tolist(), codes.ravel()
+        if group_by == "month":
+            keys, codes = np.unique(self.created_at[mask].astype("datetime64[M]"), return_inverse=True)
+            return [str(key) for key in keys], codes.ravel()
+        dictionary, column = (self._roles, self.role_codes) if group_by == "role" else (self._results, self.result_codes)
+        keys, codes = np.unique(column[mask], return_inverse=True)
+        return [dictionary.values[key] for key in keys], codes.ravel()
+
+    @staticmethod
+    def _group_medians(codes: np.ndarray, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Median of values within each group code, from one lexsort"""
+        ordered = values[np.lexsort((values, codes))]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        medians = np.full(len(counts), np.nan)
+        nonempty = counts > 0
+        low = starts[nonempty] + (counts[nonempty] - 1) // 2
+        high = starts[nonempty] + counts[nonempty] // 2
+        medians[nonempty] = (ordered[low] + ordered[high]) / 2
+        return medians
+
+
+column_store = ColumnStore()
@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from app.db.models import CompanyProfile, Experience
+from app.services.keyword_taxonomy import keyword_matcher
+
+# Interview questions are ranked by cluster in the question bank, not here
+PROFILE_FIELDS = ("rounds", "skills")
+
+
+def _experience_values(experience: Experience) -> Dict[str, Set[str]]:
+    """Distinct rounds and skills one experience contributes"""
+    values: Dict[str, Set[str]] = {field: set() for field in PROFILE_FIELDS}
+
+    if isinstance(experience.interview_rounds, list):
+        for round_data in experience.interview_rounds:
+            if isinstance(round_data, dict):
+                values["rounds"].add(str(round_data.get('round_name') or round_data.get('round_type') or 'Unknown'))
+
+    if experience.preparation_strategy:
+        values["skills"] = keyword_matcher.labels(experience.preparation_strategy, "skill")
+
+    return values
+
+
+def _ranked(counts: Counter) -> List[List]:
+    """[[value, count], ...] by count, ties broken alphabetically so the order is stable"""
+    return [
+        [value, count]
+        for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        if count > 0
+    ]
+
+
+def _add_counts(profile: CompanyProfile, counts: Dict[str, Counter], experience_count: int) -> None:
+    profile.experience_count += experience_count
+    for field in PROFILE_FIELDS:
+        merged = Counter(dict(getattr(profile, field) or []))
+        merged.update(counts[field])
+        setattr(profile, field, _ranked(merged))
+
+
+def _get_or_create(db: Session, company_id: int) -> CompanyProfile:
+    profile = db.query(CompanyProfile).filter(CompanyProfile.company_id == company_id).first()
+    if profile is None:
+        profile = CompanyProfile(company_id=company_id, experience_count=0, rounds=[], skills=[])
+        db.add(profile)
+    return profile
+
+
+def apply_experience(db: Session, experience: Experience, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one experience's contribution.
+
+    Runs inside the caller's transaction.
+    """
+    if experience.company_id is None:
+        return
+
+    values = _experience_values(experience)
+    counts = {field: Counter({value: sign for value in values[field]}) for field in PROFILE_FIELDS}
+    _add_counts(_get_or_create(db, experience.company_id), counts, sign)
+    db.flush()
+
+
+def reassign_company(db: Session, source_id: int, target_id: int) -> None:
+    """Fold one company's profile into another's after a registry merge"""
+    source = db.query(CompanyProfile).filter(CompanyProfile.company_id == source_id).first()
+    if source is None:
+        return
+
+    counts = {field: Counter(dict(getattr(source, field) or [])) for field in PROFILE_FIELDS}
+    experience_count = source.experience_count
+    db.delete(source)
+    db.flush()
+    _add_counts(_get_or_create(db, target_id), counts, experience_count)
+    db.flush()
+
+
+def get_profile(db: Session, company_id: int) -> Optional[CompanyProfile]:
+    return db.query(CompanyProfile).filter(CompanyProfile.company_id == company_id).first()
+
+
+def top_values(ranked: List[List], limit: int) -> List[str]:
+    return [value for value, _ in ranked[:limit]]
+
+
+def rebuild_company_profiles(db: Session) -> int:
+    """Recompute every company profile from the published experiences"""
+    profiles: Dict[int, Dict[str, Counter]] = defaultdict(lambda: {field: Counter() for field in PROFILE_FIELDS})
+    experience_counts: Counter = Counter()
+    count = 0
+
+    experiences = db.query(Experience).filter(
+        Experience.is_published == True,
+        Experience.company_id.isnot(None)
+    ).yield_per(500)
+    for experience in experiences:
+        counts = profiles[experience.company_id]
+        for field, values in _experience_values(experience).items():
+            counts[field].update(values)
+        experience_counts[experience.company_id] += 1
+        count += 1
+
+    db.query(CompanyProfile).delete(synchronize_session=False)
+    db.add_all(
+        CompanyProfile(
+            company_id=company_id,
+            experience_count=experience_counts[company_id],
+            **{field: _ranked(counts[field]) for field in PROFILE_FIELDS}
+        )
+        for company_id, counts in profiles.items()
+    )
+    db.commit()
+    return count
+
+
+def company_profiles_missing(db: Session) -> bool:
+    """True when there are published experiences but no profiles yet (first start)"""
+    if db.query(CompanyProfile.id).first() is not None:
+        return False
+    return db.query(Experience.id).filter(
+        Experience.is_published == True,
+        Experience.company_id.isnot(None)
+    ).first() is not None
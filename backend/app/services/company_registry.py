@@ -0,0 +1,114 @@
+import re
+import unicodedata
+from typing import Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.models import Company, CompanyAlias, Experience
+from app.services.publication import on_company_merge
+
+# Trailing legal-form words that don't change which company is meant
+# ("Infosys Pvt Ltd" -> "infosys"). Words that can be part of a name ("Air
+# India", "Ford Motor Company") stay; regional variants are linked through
+# company aliases instead.
+IGNORED_SUFFIXES = {
+    "inc", "incorporated", "ltd", "limited", "pvt", "private", "llc", "llp",
+    "plc", "corp", "corporation", "gmbh"
+}
+
+
+def normalize_company_name(name: str) -> str:
+    """Reduce a free-text company name to its registry key"""
+    text = unicodedata.normalize("NFKC", name or "").lower().replace("&", " and ")
+    tokens = re.findall(r"[a-z0-9]+", text)
+    while len(tokens) > 1 and tokens[-1] in IGNORED_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def find_company(db: Session, name: str) -> Optional[Company]:
+    """Look up a company by name or alias using the normalized-key indexes"""
+    key = normalize_company_name(name)
+    if not key:
+        return None
+
+    company = db.query(Company).filter(Company.normalized_name == key).first()
+    if company:
+        return company
+
+    alias = db.query(CompanyAlias).filter(CompanyAlias.normalized_alias == key).first()
+    return alias.company if alias else None
+
+
+def resolve_company(db: Session, name: str) -> Optional[Company]:
+    """Find the company for a name, registering it on first sight"""
+    company = find_company(db, name)
+    if company or not normalize_company_name(name):
+        return company
+
+    company = Company(name=name.strip(), normalized_name=normalize_company_name(name))
+    try:
+        with db.begin_nested():
+            db.add(company)
+    except IntegrityError:
+        # A concurrent request registered it between the lookup and the insert
+        return find_company(db, name)
+    return company
+
+
+def merge_company_alias(db: Session, alias: str, canonical_name: str) -> Company:
+    """Make `alias` resolve to `canonical_name`, folding in any company it already names"""
+    target = resolve_company(db, canonical_name)
+    # The admin's spelling becomes the display name
+    target.name = canonical_name.strip()
+    key = normalize_company_name(alias)
+    if not key or key == target.normalized_name:
+        return target
+
+    source = find_company(db, alias)
+    if source and source.id != target.id:
+        db.query(Experience).filter(Experience.company_id == source.id).update(
+            {Experience.company_id: target.id}, synchronize_session=False
+        )
+        db.query(CompanyAlias).filter(CompanyAlias.company_id == source.id).update(
+            {CompanyAlias.company_id: target.id}, synchronize_session=False
+        )
+        on_company_merge(db, source.id, target.id)
+        db.delete(source)
+        db.flush()
+
+    existing = db.query(CompanyAlias).filter(CompanyAlias.normalized_alias == key).first()
+    if existing:
+        existing.company_id = target.id
+    else:
+        db.add(CompanyAlias(company_id=target.id, alias=alias.strip(), normalized_alias=key))
+    db.flush()
+    return target
+
+
+def backfill_company_ids(db: Session, batch_size: int = 500) -> int:
+    """Link experiences created before the registry existed to their company"""
+    resolved: Dict[str, Optional[int]] = {}
+    count = 0
+    last_id = 0
+
+    while True:
+        experiences = db.query(Experience).filter(
+            Experience.company_id.is_(None),
+            Experience.id > last_id
+        ).order_by(Experience.id).limit(batch_size).all()
+        if not experiences:
+            break
+
+        for experience in experiences:
+            key = normalize_company_name(experience.company_name)
+            if key not in resolved:
+                company = resolve_company(db, experience.company_name)
+                resolved[key] = company.id if company else None
+            if resolved[key] is not None:
+                experience.company_id = resolved[key]
+                count += 1
+        last_id = experiences[-1].id
+
+        db.commit()
+
+    return count
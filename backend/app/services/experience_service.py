@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query, joinedload, load_only
+from app.db.models import Experience, User
+from app.schemas.experience import ExperienceResponse, ExperienceSummaryResponse
+
+SUMMARY_FIELDS = list(ExperienceSummaryResponse.model_fields)
+
+# Columns every projection needs: keyset pagination and author visibility
+_REQUIRED_COLUMNS = ("id", "created_at", "bookmark_count", "is_anonymous", "user_id")
+
+
+def with_author(query: Query) -> Query:
+    """Load each experience's author in the same SELECT (avoids N+1 lookups)"""
+    return query.options(joinedload(Experience.user))
+
+
+def apply_experience_filters(
+    query: Query,
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    published_only: bool = True
+) -> Query:
+    """Apply the public list filters shared by the experience read endpoints"""
+    if published_only:
+        query = query.filter(Experience.is_published == True)
+    
+    if company_name:
+        query = query.filter(Experience.company_name.ilike(f"%{company_name}%"))
+    
+    if role:
+        query = query.filter(Experience.role.ilike(f"%{role}%"))
+    
+    return query
+
+
+def resolve_fields(view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """Turn view/fields query parameters into a field list (None = full response)"""
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in ExperienceResponse.model_fields]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}"
+            )
+        return requested
+    if view == "summary":
+        return SUMMARY_FIELDS
+    return None
+
+
+def with_projection(query: Query, fields: List[str]) -> Query:
+    """SELECT only the requested columns, leaving large JSON/Text columns unread"""
+    names = set(fields) | set(_REQUIRED_COLUMNS)
+    columns = [getattr(Experience, name) for name in names if name != "user_name"]
+    query = query.options(load_only(*columns))
+    if "user_name" in fields:
+        query = query.options(joinedload(Experience.user).load_only(User.full_name))
+    return query
+
+
+def to_projected_dicts(
+    experiences: List[Experience],
+    fields: List[str],
+    reveal_author: bool = False
+) -> List[Dict[str, Any]]:
+    """Serialize projected rows straight to JSON-ready dicts (no model validation)"""
+    results = []
+    for exp in experiences:
+        item = {}
+        for field in fields:
+            if field == "user_name":
+                visible = exp.user is not None and (reveal_author or not exp.is_anonymous)
+                value = exp.user.full_name if visible else None
+            else:
+                value = getattr(exp, field)
+            item[field] = value.isoformat() if isinstance(value, datetime) else value
+        results.append(item)
+    return results
+
+
+def to_experience_response(experience: Experience, reveal_author: bool = False) -> ExperienceResponse:
+    """Build an ExperienceResponse, filling user_name from the loaded author.
+
+    Anonymous experiences only expose the author when reveal_author is set
+    (admin views).
+    """
+    response = ExperienceResponse.model_validate(experience, from_attributes=True)
+    if experience.user is not None and (reveal_author or not experience.is_anonymous):
+        response.user_name = experience.user.full_name
+    return response
+
+
+def to_experience_responses(
+    experiences: List[Experience],
+    reveal_author: bool = False
+) -> List[ExperienceResponse]:
+    """Serialize a page of experiences loaded with with_author()"""
+    return [to_experience_response(exp, reveal_author) for exp in experiences]
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+from app.db.database import SessionLocal
+from app.db.models import Experience, User
+from app.services.experience_service import apply_experience_filters
+
+EXPORT_FIELDS = [
+    "id", "company_name", "role", "package_offered", "final_result",
+    "interview_rounds", "questions_asked", "preparation_strategy",
+    "resources_followed", "rejection_reasons", "is_anonymous",
+    "is_published", "user_name", "created_at"
+]
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+
+def _export_rows(
+    company_name: Optional[str],
+    role: Optional[str],
+    published_only: bool
+) -> Iterator[Dict[str, Any]]:
+    """Yield export records one by one from a streamed query.
+
+    Uses its own session because the generator outlives the request handler.
+    """
+    db = SessionLocal()
+    try:
+        columns = [getattr(Experience, field) for field in EXPORT_FIELDS if field != "user_name"]
+        query = db.query(*columns, User.full_name).outerjoin(User, User.id == Experience.user_id)
+        query = apply_experience_filters(query, company_name, role, published_only)
+        query = query.order_by(Experience.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        for row in query:
+            record = dict(row._mapping)
+            full_name = record.pop("full_name")
+            record["user_name"] = None if record["is_anonymous"] else full_name
+            if isinstance(record["created_at"], datetime):
+                record["created_at"] = record["created_at"].isoformat()
+            yield record
+    finally:
+        db.close()
+
+
+def stream_ndjson(
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    published_only: bool = True
+) -> Iterator[str]:
+    """One JSON object per line"""
+    for record in _export_rows(company_name, role, published_only):
+        yield json.dumps({field: record[field] for field in EXPORT_FIELDS}, default=str) + "\n"
+
+
+def stream_csv(
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    published_only: bool = True
+) -> Iterator[str]:
+    """CSV with a header row; JSON columns are embedded as JSON text"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    writer.writerow(EXPORT_FIELDS)
+    yield flush()
+
+    for record in _export_rows(company_name, role, published_only):
+        writer.writerow([
+            json.dumps(record[field]) if isinstance(record[field], (dict, list)) else record[field]
+            for field in EXPORT_FIELDS
+        ])
+        yield flush()
@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func, literal, literal_column, null, or_, tuple_
+from sqlalchemy.orm import Session
+from app.db.models import Company, Experience
+from app.services.experience_service import apply_experience_filters
+
+FACETS = ("company", "role", "final_result", "package_band")
+
+# Package bands in LPA: (label, exclusive upper bound); missing or zero
+# packages fall in UNDISCLOSED_BAND
+PACKAGE_BANDS: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("0-5", 5),
+    ("5-10", 10),
+    ("10-20", 20),
+    ("20-30", 30),
+    ("30+", None),
+)
+UNDISCLOSED_BAND = "undisclosed"
+BAND_LABELS = (UNDISCLOSED_BAND,) + tuple(label for label, _ in PACKAGE_BANDS)
+
+
+def _band_index():
+    """Band position in BAND_LABELS as a SQL expression.
+
+    Thresholds are inlined rather than bound so the expression renders
+    identically in the select list and in GROUPING SETS on PostgreSQL.
+    """
+    package = Experience.package_offered
+    zero = literal_column("0")
+    whens = [(or_(package.is_(None), package <= zero), zero)]
+    for index, (_, upper) in enumerate(PACKAGE_BANDS, start=1):
+        if upper is not None:
+            whens.append((package < literal_column(str(upper)), literal_column(str(index))))
+    return case(*whens, else_=literal_column(str(len(PACKAGE_BANDS))))
+
+
+def _band_criteria(band: str) -> List[Any]:
+    """WHERE criteria selecting one package band"""
+    package = Experience.package_offered
+    if band == UNDISCLOSED_BAND:
+        return [or_(package.is_(None), package <= 0)]
+    lower = 0
+    for label, upper in PACKAGE_BANDS:
+        if label == band:
+            criteria = [package > 0, package >= lower]
+            if upper is not None:
+                criteria.append(package < upper)
+            return criteria
+        lower = upper
+    raise ValueError(f"Unknown package band: {band}")
+
+
+def facet_key(
+    company_name: Optional[str],
+    role: Optional[str],
+    final_result: Optional[str],
+    package_band: Optional[str],
+    limit: int
+) -> str:
+    """Normalised filter key; company and role match case-insensitively, so case is folded"""
+    return "|".join([
+        (company_name or "").strip().casefold(),
+        (role or "").strip().casefold(),
+        final_result or "",
+        package_band or "",
+        str(limit)
+    ])
+
+
+def facet_counts(
+    db: Session,
+    company_name: Optional[str] = None,
+    role: Optional[str] = None,
+    final_result: Optional[str] = None,
+    package_band: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+    """Total matches and counts per company, role, final result and package band for one filter set.
+
+    The total and all four facets come from one statement: GROUPING SETS
+    (with a grand-total set) on PostgreSQL, otherwise a UNION ALL of
+    per-facet GROUP BYs and a plain COUNT over the same filter. Facets are
+    ordered by count and cut to `limit` values each; every package band
+    is returned, in band order. The total is taken before any cut.
+    """
+    expressions = {
+        # Registry names, so spelling variants of one company count together
+        "company": func.coalesce(Company.name, Experience.company_name),
+        "role": Experience.role,
+        "final_result": Experience.final_result,
+        "package_band": _band_index(),
+    }
+
+    def filtered(query):
+        query = apply_experience_filters(
+            query.outerjoin(Company, Company.id == Experience.company_id),
+            company_name.strip() if company_name else None,
+            role.strip() if role else None
+        )
+        if final_result:
+            query = query.filter(Experience.final_result == final_result)
+        if package_band:
+            query = query.filter(*_band_criteria(package_band))
+        return query
+
+    if db.bind.dialect.name == "postgresql":
+        columns = list(expressions.values())
+        query = filtered(db.query(
+            *columns,
+            *[func.grouping(column) for column in columns],
+            func.count(Experience.id)
+        )).group_by(func.grouping_sets(*columns, tuple_()))
+
+        rows = []
+        for row in query:
+            values, grouped, count = row[:4], row[4:8], row[8]
+            if 0 not in grouped:
+                # The grand-total set groups by nothing
+                rows.append((None, None, count))
+                continue
+            # GROUPING() is 0 for the one column each set groups by
+            index = list(grouped).index(0)
+            rows.append((FACETS[index], values[index], count))
+    else:
+        queries = [
+            filtered(db.query(literal(name).label("facet"), expression.label("value"), func.count(Experience.id)))
+            .group_by(expression)
+            for name, expression in expressions.items()
+        ]
+        queries.append(filtered(db.query(null().label("facet"), null().label("value"), func.count(Experience.id))))
+        rows = queries[0].union_all(*queries[1:]).all()
+
+    total = 0
+    facets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in FACETS}
+    for name, value, count in rows:
+        if name is None:
+            total = count
+            continue
+        if name == "package_band":
+            value = BAND_LABELS[int(value)]
+        facets[name].append({"value": value, "count": count})
+
+    for name, values in facets.items():
+        if name == "package_band":
+            # A fixed, short list: every band in band order, empty ones included
+            counts = {item["value"]: item["count"] for item in values}
+            values[:] = [{"value": label, "count": counts.get(label, 0)} for label in BAND_LABELS]
+            continue
+        values.sort(key=lambda item: (-item["count"], item["value"] or ""))
+        if limit:
+            del values[limit:]
+    return total, facets
@@ -0,0 +1,28 @@
+import asyncio
+import traceback
+from typing import Any, Callable
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+
+
+def run_job(job: Callable[[Session], Any]) -> Any:
+    """Run a maintenance job with its own database session"""
+    db = SessionLocal()
+    try:
+        return job(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(name: str, job: Callable[[Session], Any], interval_seconds: int) -> None:
+    """Run `job` every interval_seconds in a worker thread until cancelled"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            result = await asyncio.to_thread(run_job, job)
+            print(f"Background job {name} finished: {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"ERROR in background job {name}: {e}")
+            traceback.print_exc()
@@ -0,0 +1,130 @@
+import json
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+from app.core.config import settings
+
+# Taxonomy -> label -> phrases. Phrases match case-insensitively on word
+# boundaries, in the plural too, and with spaces matching hyphens or any run
+# of whitespace ("data structure" matches "Data-Structures").
+DEFAULT_TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    # Skills named in an experience's preparation strategy
+    "skill": {
+        "Data Structures & Algorithms": ["dsa", "data structure"],
+        "System Design": ["system design"],
+        "Coding Practice": ["coding", "programming"],
+        "Object-Oriented Programming": ["oops", "object oriented"],
+    },
+    # Keywords that put a chat message in the bot's scope
+    "campus": {
+        "campus": [
+            "interview", "placement", "campus", "company", "round", "question",
+            "preparation", "resume", "coding", "dsa", "technical", "hr", "managerial",
+            "offer", "package", "rejection", "selected", "experience", "skill",
+            "leetcode", "hackerrank", "codeforces", "project", "internship"
+        ],
+    },
+    # Topics of the canned chat answers used when the model is unavailable
+    "chat_topic": {
+        "dsa": ["dsa", "data structure", "algorithm", "coding"],
+        "resume": ["resume", "cv", "curriculum"],
+        "hr": ["hr", "human resource", "behavioral"],
+        "technical": ["technical", "round", "interview"],
+    },
+}
+
+_SEPARATOR = r"[\s\-]+"
+
+
+def _normalize(phrase: str) -> str:
+    return re.sub(_SEPARATOR, " ", phrase.strip().lower())
+
+
+def _variants(phrase: str) -> Iterable[str]:
+    yield phrase
+    # "company" -> "companies"; plain "s"/"es" plurals are matched by the pattern
+    if len(phrase) > 2 and phrase.endswith("y") and phrase[-2] not in "aeiou":
+        yield phrase[:-1] + "ies"
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Regex alternation of phrases factored into a trie ("dsa|data" -> "d(?:ata|sa)").
+
+    Matching at a position then follows one path of the trie instead of
+    trying every phrase, so a scan costs O(text length x longest phrase).
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def pattern(node: dict) -> str:
+        branches = [
+            (_SEPARATOR if char == " " else re.escape(char)) + pattern(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if "" in node:
+            # Greedy: prefer the longer phrase, fall back to the one ending here
+            return f"(?:{'|'.join(branches)})?"
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return pattern(trie)
+
+
+class KeywordMatcher:
+    """Finds taxonomy labels in text with one compiled regex, in a single pass"""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]]):
+        self.taxonomy = taxonomy
+        self._labels: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        for name, labels in taxonomy.items():
+            for label, phrases in labels.items():
+                for phrase in phrases:
+                    for variant in _variants(_normalize(phrase)):
+                        self._labels[variant].add((name, label))
+
+        self._pattern = re.compile(
+            rf"(?<!\w)({_trie_pattern(self._labels)})(?:e?s)?(?!\w)",
+            re.IGNORECASE
+        ) if self._labels else None
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Labels found in text, by taxonomy"""
+        found: Dict[str, Set[str]] = defaultdict(set)
+        if text and self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                phrase = match.group(1).lower()
+                if phrase not in self._labels:
+                    # Matched through a hyphen or unusual whitespace
+                    phrase = _normalize(phrase)
+                for name, label in self._labels.get(phrase, ()):
+                    found[name].add(label)
+        return found
+
+    def labels(self, text: str, taxonomy: str) -> Set[str]:
+        return self.scan(text).get(taxonomy, set())
+
+
+def load_taxonomy() -> Dict[str, Dict[str, List[str]]]:
+    """Built-in taxonomy with KEYWORD_TAXONOMY_FILE merged over it.
+
+    The file is JSON shaped like DEFAULT_TAXONOMY; its phrases are added to
+    existing labels and its new labels and taxonomies are added as-is.
+    """
+    taxonomy = {
+        name: {label: list(phrases) for label, phrases in labels.items()}
+        for name, labels in DEFAULT_TAXONOMY.items()
+    }
+    if settings.KEYWORD_TAXONOMY_FILE:
+        with open(settings.KEYWORD_TAXONOMY_FILE, encoding="utf-8") as f:
+            for name, labels in json.load(f).items():
+                for label, phrases in labels.items():
+                    taxonomy.setdefault(name, {}).setdefault(label, []).extend(phrases)
+    return taxonomy
+
+
+keyword_matcher = KeywordMatcher(load_taxonomy())
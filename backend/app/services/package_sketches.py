@@ -0,0 +1,273 @@
+import math
+import random
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
+from app.db.models import Experience, PackageSketch, User
+
+# Accuracy/size trade-off: rank error is roughly 1.7 / k, and a sketch keeps
+# at most about 3k values however many packages it has seen
+DEFAULT_K = 200
+_MIN_CAPACITY = 2
+_CAPACITY_DECAY = 2 / 3
+
+_rng = random.Random()
+
+
+class KLLSketch:
+    """KLL streaming quantile sketch (Karnin, Lang & Liberty).
+
+    Values live in levels of compactors; an item at level h stands for 2**h
+    inserted values. A full level is sorted and every other item is promoted
+    to the next level, so memory stays bounded while ranks stay within a
+    small, provable error. Two sketches merge by concatenating their levels.
+    """
+
+    def __init__(self, k: int = DEFAULT_K):
+        self.k = k
+        self.n = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.levels: List[List[float]] = [[]]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(_MIN_CAPACITY, int(math.ceil(self.k * _CAPACITY_DECAY ** depth)))
+
+    def _compress(self) -> None:
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for level, items in enumerate(self.levels):
+                if len(items) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                # An odd item out stays behind so no weight is lost
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[_rng.randint(0, 1)::2])
+                self.levels[level] = keep
+                break
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        self.levels[0].append(value)
+        self.n += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        if not other.n:
+            return
+        self.k = min(self.k, other.k)
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(items)
+        self._compress()
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        return sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.levels)
+            for value in items
+        )
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at rank q (0..1)"""
+        if not self.n:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        weighted = self._weighted()
+        target = q * sum(weight for _, weight in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return self.max
+
+    def histogram(self, bins: int) -> List[Dict[str, Any]]:
+        """Equal-width buckets between min and max with approximate counts"""
+        if not self.n:
+            return []
+        width = (self.max - self.min) / bins
+        if not width:
+            return [{"lower": self.min, "upper": self.max, "count": self.n}]
+        counts = [0] * bins
+        for value, weight in self._weighted():
+            counts[min(int((value - self.min) / width), bins - 1)] += weight
+        return [
+            {
+                "lower": round(self.min + i * width, 2),
+                "upper": round(self.min + (i + 1) * width, 2),
+                "count": count
+            }
+            for i, count in enumerate(counts)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "min": self.min, "max": self.max, "levels": self.levels}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(data.get("k", DEFAULT_K))
+        sketch.n = data.get("n", 0)
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        sketch.levels = [list(items) for items in data.get("levels") or [[]]]
+        return sketch
+
+
+def _scope_keys(experience: Experience) -> Iterator[Tuple[str, str]]:
+    """(scope, key) sketches an experience's package contributes to"""
+    # Experiences without a registry company still count towards the overall view
+    yield "company", str(experience.company_id) if experience.company_id else ""
+    yield "role", experience.role
+    if experience.user is not None and experience.user.college_name:
+        yield "college", experience.user.college_name
+
+
+def _published_packages(db: Session, scope: str, key: str) -> List[float]:
+    # Zero packages mean "not disclosed", as do NULLs
+    query = db.query(Experience.package_offered).filter(
+        Experience.is_published == True,
+        Experience.package_offered.isnot(None),
+        Experience.package_offered != 0
+    )
+    if scope == "company":
+        query = query.filter(Experience.company_id == int(key) if key else Experience.company_id.is_(None))
+    elif scope == "role":
+        query = query.filter(Experience.role == key)
+    else:
+        query = query.join(User, User.id == Experience.user_id).filter(User.college_name == key)
+    return [package for (package,) in query]
+
+
+def _save(db: Session, scope: str, key: str, sketch: KLLSketch) -> None:
+    row = db.query(PackageSketch).filter(
+        PackageSketch.scope == scope,
+        PackageSketch.key == key
+    ).with_for_update().first()
+    if row is None:
+        db.add(PackageSketch(scope=scope, key=key, sketch=sketch.to_dict()))
+    else:
+        row.sketch = sketch.to_dict()
+    db.flush()
+
+
+def _load(db: Session, scope: str, key: str) -> KLLSketch:
+    row = db.query(PackageSketch).filter(
+        PackageSketch.scope == scope,
+        PackageSketch.key == key
+    ).with_for_update().first()
+    return KLLSketch.from_dict(row.sketch) if row else KLLSketch()
+
+
+def apply_experience(db: Session, experience: Experience, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) an experience's package.
+
+    Sketches only support insertion, so a removal rebuilds the affected
+    sketches from the remaining published experiences. Runs inside the
+    caller's transaction.
+    """
+    if not experience.package_offered:
+        return
+
+    for scope, key in _scope_keys(experience):
+        if sign > 0:
+            sketch = _load(db, scope, key)
+            sketch.update(experience.package_offered)
+        else:
+            sketch = KLLSketch()
+            for package in _published_packages(db, scope, key):
+                sketch.update(package)
+        _save(db, scope, key, sketch)
+
+
+def rebuild_college_sketches(db: Session, *college_names: Optional[str]) -> None:
+    """Recompute college sketches after authors moved between colleges.
+
+    College sketches are keyed by the author's college when the package was
+    added, so a profile change leaves both the old and the new college's
+    sketch wrong. Runs inside the caller's transaction, after the profile
+    change is flushed.
+    """
+    for college_name in {name for name in college_names if name}:
+        packages = _published_packages(db, "college", college_name)
+        if packages:
+            sketch = KLLSketch()
+            for package in packages:
+                sketch.update(package)
+            _save(db, "college", college_name, sketch)
+        else:
+            db.query(PackageSketch).filter(
+                PackageSketch.scope == "college",
+                PackageSketch.key == college_name
+            ).delete(synchronize_session=False)
+
+
+def reassign_company(db: Session, source_id: int, target_id: int) -> None:
+    """Merge one company's sketch into another's after a registry merge"""
+    source = db.query(PackageSketch).filter(
+        PackageSketch.scope == "company",
+        PackageSketch.key == str(source_id)
+    ).first()
+    if source is None:
+        return
+
+    sketch = _load(db, "company", str(target_id))
+    sketch.merge(KLLSketch.from_dict(source.sketch))
+    db.delete(source)
+    db.flush()
+    _save(db, "company", str(target_id), sketch)
+
+
+def merged_sketch(db: Session, scope: str, *criteria) -> KLLSketch:
+    """Merge every sketch of a scope matching the given criteria on PackageSketch.key"""
+    merged = KLLSketch()
+    rows = db.query(PackageSketch.sketch).filter(PackageSketch.scope == scope, *criteria)
+    for (data,) in rows:
+        merged.merge(KLLSketch.from_dict(data))
+    return merged
+
+
+def rebuild_package_sketches(db: Session) -> int:
+    """Recompute every package sketch from the published experiences"""
+    sketches: Dict[Tuple[str, str], KLLSketch] = defaultdict(KLLSketch)
+    count = 0
+
+    experiences = db.query(Experience).filter(
+        Experience.is_published == True,
+        Experience.package_offered.isnot(None),
+        Experience.package_offered != 0
+    ).options(joinedload(Experience.user)).order_by(Experience.id)
+    for experience in experiences:
+        for scope_key in _scope_keys(experience):
+            sketches[scope_key].update(experience.package_offered)
+        count += 1
+
+    db.query(PackageSketch).delete(synchronize_session=False)
+    db.add_all(
+        PackageSketch(scope=scope, key=key, sketch=sketch.to_dict())
+        for (scope, key), sketch in sketches.items()
+    )
+    db.commit()
+    return count
+
+
+def package_sketches_missing(db: Session) -> bool:
+    """True when published experiences disclose packages but no sketches exist yet (first start)"""
+    if db.query(PackageSketch.id).first() is not None:
+        return False
+    return db.query(Experience.id).filter(
+        Experience.is_published == True,
+        Experience.package_offered.isnot(None),
+        Experience.package_offered != 0
+    ).first() is not None
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import Company, Experience, PreparationGuide
+from app.services.ai_service import AIService
+from app.services.jobs import run_job
+from app.api.response_cache import company_tag, invalidate
+
+# Guides are written for this role until suggestions take one
+GUIDE_ROLE = "Software Engineer"
+
+# Company key -> generation running in this process; concurrent requests
+# for the same company await it instead of starting another
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; they are stored as UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def experience_hash(experience_ids: List[int]) -> str:
+    """Identity of the experience set a guide is generated from"""
+    ids = ",".join(str(experience_id) for experience_id in sorted(experience_ids))
+    return hashlib.sha1(ids.encode("utf-8")).hexdigest()
+
+
+def parse_tips(guide: str) -> List[str]:
+    """Bullet points from a generated guide that are long enough to be tips"""
+    tips = []
+    for line in (guide or "").split("\n"):
+        line = line.strip()
+        if line and (line.startswith('-') or line.startswith('•') or line.startswith('*')):
+            tip = line.lstrip('-•*').strip()
+            if tip and len(tip) > 10:
+                tips.append(tip)
+    return tips
+
+
+def is_stale(guide: PreparationGuide, digest: str) -> bool:
+    if guide.experience_hash != digest:
+        return True
+    # Template guides written while the model was unreachable are retried
+    age = (datetime.now(timezone.utc) - _utc(guide.generated_at)).total_seconds()
+    return not guide.from_model and age > settings.AI_GUIDE_RETRY_SECONDS
+
+
+def _load_experiences(db: Session, experience_ids: List[int]) -> List[Experience]:
+    experiences = db.query(Experience).filter(Experience.id.in_(experience_ids)).all()
+    by_id = {exp.id: exp for exp in experiences}
+    return [by_id[i] for i in experience_ids if i in by_id]
+
+
+def _store(db: Session, company_key: str, digest: str, guide: str, from_model: bool) -> List[str]:
+    """Upsert the guide and release the regeneration claim; returns the stored tips"""
+    entry = db.query(PreparationGuide).filter(PreparationGuide.company_key == company_key).first()
+    if entry is None:
+        entry = PreparationGuide(company_key=company_key)
+        db.add(entry)
+
+    entry.experience_hash = digest
+    entry.guide = guide
+    entry.tips = parse_tips(guide)
+    entry.from_model = from_model
+    entry.generated_at = datetime.now(timezone.utc)
+    entry.regenerating_since = None
+    tips = entry.tips
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the first guide for this company at the same time
+        db.rollback()
+    return tips
+
+
+async def _generate(
+    ai_service: AIService,
+    company_id: int,
+    company_name: str,
+    company_key: str,
+    experience_ids: List[int],
+    digest: str
+) -> List[str]:
+    """Generate a guide from the given experiences, persist it and return its tips"""
+    try:
+        experiences = await asyncio.to_thread(run_job, lambda db: _load_experiences(db, experience_ids))
+        guide = await ai_service.generate_preparation_guide(company_name, GUIDE_ROLE, experiences, fallback=False)
+        from_model = guide is not None
+        if guide is None:
+            guide = ai_service._generate_fallback_guide(company_name, GUIDE_ROLE, experiences)
+
+        tips = await asyncio.to_thread(
+            run_job, lambda db: _store(db, company_key, digest, guide, from_model)
+        )
+        # Cached suggestion responses still carry the previous tips
+        invalidate([company_tag(company_id)])
+        return tips
+    finally:
+        _inflight.pop(company_key, None)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"ERROR generating preparation guide: {task.exception()}")
+        traceback.print_exception(task.exception())
+
+
+def _start(ai_service: AIService, company: Company, experience_ids: List[int], digest: str) -> asyncio.Task:
+    task = _inflight.get(company.normalized_name)
+    if task is None:
+        task = asyncio.create_task(_generate(
+            ai_service, company.id, company.name, company.normalized_name, experience_ids, digest
+        ))
+        task.add_done_callback(_log_failure)
+        _inflight[company.normalized_name] = task
+    return task
+
+
+def _claim(db: Session, company_key: str) -> bool:
+    """Take the regeneration claim for a stale guide; False if another worker holds it"""
+    now = datetime.now(timezone.utc)
+    expired = now - timedelta(seconds=settings.AI_GUIDE_REGENERATION_LEASE_SECONDS)
+    claimed = db.query(PreparationGuide).filter(
+        PreparationGuide.company_key == company_key,
+        or_(PreparationGuide.regenerating_since.is_(None), PreparationGuide.regenerating_since < expired)
+    ).update({PreparationGuide.regenerating_since: now}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+async def get_preparation_tips(
+    db: Session,
+    ai_service: AIService,
+    company: Company,
+    experience_ids: List[int],
+    wait: bool = True
+) -> Optional[List[str]]:
+    """Tips from the company's preparation guide, generating it only when needed.
+
+    Guides are persisted per company together with a hash of the ids of the
+    experiences they are generated from. A current guide is returned as-is. A stale
+    one is returned immediately while one background task regenerates it;
+    across workers the regeneration is claimed in the database.
+
+    Only a company with no guide yet waits for the model, and for at most
+    AI_TIPS_LATENCY_BUDGET_SECONDS. None is returned when that runs out or
+    when wait is False; generation carries on and stores the guide.
+    """
+    digest = experience_hash(experience_ids)
+    entry = db.query(PreparationGuide).filter(PreparationGuide.company_key == company.normalized_name).first()
+
+    if entry is None:
+        task = _start(ai_service, company, experience_ids, digest)
+        if not wait:
+            return None
+        try:
+            return list(await asyncio.wait_for(asyncio.shield(task), settings.AI_TIPS_LATENCY_BUDGET_SECONDS))
+        except asyncio.TimeoutError:
+            return None
+
+    tips = list(entry.tips)
+    if is_stale(entry, digest) and company.normalized_name not in _inflight and _claim(db, company.normalized_name):
+        _start(ai_service, company, experience_ids, digest)
+    return tips
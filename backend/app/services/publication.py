@@ -0,0 +1,35 @@
+from sqlalchemy.orm import Session
+from app.db.models import Experience
+from app.services.search_index import search_index
+from app.services import autocomplete, company_profiles, package_sketches, question_bank, rollups
+
+
+def on_publication_change(db: Session, experience: Experience, published: bool) -> None:
+    """Keep derived read structures in step when an experience is published or unpublished.
+
+    Call only when the publication state actually flips. Runs inside the
+    caller's transaction, so the derived data commits (or rolls back)
+    together with the publication state itself; the in-memory autocomplete
+    indexes change only once it commits.
+    """
+    if published:
+        search_index.index_experience(db, experience)
+    else:
+        search_index.remove_experience(db, experience.id)
+
+    sign = 1 if published else -1
+    rollups.apply_experience(db, experience, sign)
+    question_bank.apply_experience(db, experience, sign)
+    package_sketches.apply_experience(db, experience, sign)
+    company_profiles.apply_experience(db, experience, sign)
+    autocomplete.apply_experience(db, experience, sign)
+
+
+def on_company_merge(db: Session, source_id: int, target_id: int) -> None:
+    """Re-key per-company derived data after the registry merges two companies"""
+    rollups.reassign_company(db, source_id, target_id)
+    question_bank.reassign_company(db, source_id, target_id)
+    package_sketches.reassign_company(db, source_id, target_id)
+    company_profiles.reassign_company(db, source_id, target_id)
+    # The target may also have been renamed; reloading the names is one GROUP BY
+    autocomplete.reload_companies(db)
@@ -0,0 +1,200 @@
+import hashlib
+import random
+import re
+import unicodedata
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from app.db.models import (
+    CompanyQuestionCount,
+    Experience,
+    ExperienceQuestion,
+    QuestionCluster,
+    QuestionLshBucket
+)
+
+# MinHash / LSH parameters. 16 bands of 4 rows make pairs with Jaccard
+# similarity around 0.5 and above likely to share a bucket; candidates are
+# then confirmed against SIMILARITY_THRESHOLD on the full signature.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.6
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are persisted, so every process must hash identically
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def _shingles(normalized: str) -> set:
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _stable_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(normalized: str) -> List[int]:
+    """MinHash signature over character shingles"""
+    hashes = [_stable_hash(shingle) for shingle in _shingles(normalized)]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature: List[int]) -> List[str]:
+    """One bucket key per LSH band"""
+    return [
+        hashlib.blake2b(
+            ",".join(map(str, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])).encode("ascii"),
+            digest_size=8
+        ).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def estimated_similarity(a: List[int], b: List[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+
+
+def find_or_create_cluster(db: Session, text: str) -> Optional[QuestionCluster]:
+    """Cluster for a question: exact normalized match, else an LSH near-duplicate, else new"""
+    normalized = normalize_question(text)
+    if not normalized:
+        return None
+
+    cluster = db.query(QuestionCluster).filter(QuestionCluster.normalized_text == normalized).first()
+    if cluster:
+        return cluster
+
+    signature = minhash(normalized)
+    buckets = band_buckets(signature)
+    candidates = db.query(QuestionCluster).join(
+        QuestionLshBucket, QuestionLshBucket.cluster_id == QuestionCluster.id
+    ).filter(or_(*[
+        and_(QuestionLshBucket.band == band, QuestionLshBucket.bucket == bucket)
+        for band, bucket in enumerate(buckets)
+    ])).distinct().all()
+
+    best, best_similarity = None, SIMILARITY_THRESHOLD
+    for candidate in candidates:
+        similarity = estimated_similarity(signature, candidate.signature)
+        if similarity >= best_similarity:
+            best, best_similarity = candidate, similarity
+    if best:
+        return best
+
+    cluster = QuestionCluster(canonical_text=str(text).strip(), normalized_text=normalized, signature=signature)
+    db.add(cluster)
+    db.flush()
+    db.add_all(
+        QuestionLshBucket(band=band, bucket=bucket, cluster_id=cluster.id)
+        for band, bucket in enumerate(buckets)
+    )
+    return cluster
+
+
+def _questions(experience: Experience) -> Iterator[str]:
+    if isinstance(experience.questions_asked, dict):
+        for category, questions in experience.questions_asked.items():
+            if isinstance(questions, list):
+                yield from (str(question) for question in questions)
+
+
+def _add_count(db: Session, company_id: Optional[int], cluster_id: int, delta: int) -> None:
+    updated = db.query(CompanyQuestionCount).filter(
+        CompanyQuestionCount.company_id.is_(None) if company_id is None else CompanyQuestionCount.company_id == company_id,
+        CompanyQuestionCount.cluster_id == cluster_id
+    ).update({CompanyQuestionCount.count: CompanyQuestionCount.count + delta}, synchronize_session=False)
+
+    if not updated:
+        db.add(CompanyQuestionCount(company_id=company_id, cluster_id=cluster_id, count=delta))
+        db.flush()
+
+
+def apply_experience(db: Session, experience: Experience, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) an experience's questions from the bank.
+
+    Each cluster counts once per experience. Runs inside the caller's transaction.
+    """
+    if sign > 0:
+        cluster_ids = set()
+        for question in _questions(experience):
+            cluster = find_or_create_cluster(db, question)
+            if cluster:
+                cluster_ids.add(cluster.id)
+        for cluster_id in cluster_ids:
+            db.add(ExperienceQuestion(experience_id=experience.id, cluster_id=cluster_id))
+            _add_count(db, experience.company_id, cluster_id, 1)
+    else:
+        links = db.query(ExperienceQuestion).filter(ExperienceQuestion.experience_id == experience.id).all()
+        for link in links:
+            _add_count(db, experience.company_id, link.cluster_id, -1)
+            db.delete(link)
+    db.flush()
+
+
+def top_questions(db: Session, company_id: Optional[int] = None, limit: int = 10) -> List[Tuple[str, int]]:
+    """Most asked question clusters for one company, or across all companies"""
+    if company_id is not None:
+        total = CompanyQuestionCount.count
+        query = db.query(QuestionCluster.canonical_text, total).join(
+            CompanyQuestionCount, CompanyQuestionCount.cluster_id == QuestionCluster.id
+        ).filter(CompanyQuestionCount.company_id == company_id, total > 0)
+    else:
+        total = func.sum(CompanyQuestionCount.count)
+        query = db.query(QuestionCluster.canonical_text, total).join(
+            CompanyQuestionCount, CompanyQuestionCount.cluster_id == QuestionCluster.id
+        ).group_by(QuestionCluster.id, QuestionCluster.canonical_text).having(total > 0)
+
+    return query.order_by(total.desc(), QuestionCluster.canonical_text).limit(limit).all()
+
+
+def reassign_company(db: Session, source_id: int, target_id: int) -> None:
+    """Fold one company's question counts into another's after a registry merge"""
+    rows = db.query(CompanyQuestionCount).filter(CompanyQuestionCount.company_id == source_id).all()
+    for row in rows:
+        cluster_id, count = row.cluster_id, row.count
+        db.delete(row)
+        db.flush()
+        _add_count(db, target_id, cluster_id, count)
+
+
+def rebuild_question_bank(db: Session) -> int:
+    """Re-cluster every published experience's questions from scratch"""
+    db.query(ExperienceQuestion).delete(synchronize_session=False)
+    db.query(CompanyQuestionCount).delete(synchronize_session=False)
+    db.query(QuestionLshBucket).delete(synchronize_session=False)
+    db.query(QuestionCluster).delete(synchronize_session=False)
+
+    count = 0
+    experiences = db.query(Experience).filter(
+        Experience.is_published == True
+    ).order_by(Experience.id).yield_per(500)
+    for experience in experiences:
+        apply_experience(db, experience, 1)
+        count += 1
+
+    db.commit()
+    return count
+
+
+def question_bank_missing(db: Session) -> bool:
+    """True when published experiences have questions but the bank is empty (first start)"""
+    if db.query(ExperienceQuestion.id).first() is not None:
+        return False
+    return db.query(Experience.id).filter(
+        Experience.is_published == True,
+        Experience.questions_asked.isnot(None)
+    ).first() is not None
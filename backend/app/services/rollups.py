@@ -0,0 +1,140 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, Tuple
+from sqlalchemy.orm import Session
+from app.db.models import AnalyticsCounter, AnalyticsRollup, Experience
+
+RollupKey = Tuple[int, str, str, str]  # (company_id, role, final_result, month)
+CounterKey = Tuple[str, str]  # (kind, key)
+
+
+def _rollup_key(experience: Experience) -> RollupKey:
+    month = experience.created_at.strftime("%Y-%m") if experience.created_at else "unknown"
+    return experience.company_id, experience.role, experience.final_result, month
+
+
+def _counter_keys(experience: Experience) -> Iterator[CounterKey]:
+    """Free-form values an experience contributes to the trends counters"""
+    if isinstance(experience.resources_followed, list):
+        for resource in experience.resources_followed:
+            yield "resource", str(resource)
+
+    if isinstance(experience.interview_rounds, list):
+        for round_data in experience.interview_rounds:
+            if isinstance(round_data, dict) and round_data.get("difficulty") is not None:
+                yield "difficulty", str(round_data["difficulty"])
+
+    if experience.rejection_reasons and experience.final_result == "Rejected":
+        yield "rejection_reason", ""
+
+
+def _package(experience: Experience) -> Tuple[float, int]:
+    # Zero packages mean "not disclosed", as do NULLs
+    if experience.package_offered:
+        return experience.package_offered, 1
+    return 0.0, 0
+
+
+def _add_rollup(db: Session, key: RollupKey, count: int, package_sum: float, package_count: int) -> None:
+    company_id, role, final_result, month = key
+    updated = db.query(AnalyticsRollup).filter(
+        AnalyticsRollup.company_id.is_(None) if company_id is None else AnalyticsRollup.company_id == company_id,
+        AnalyticsRollup.role == role,
+        AnalyticsRollup.final_result == final_result,
+        AnalyticsRollup.month == month
+    ).update({
+        AnalyticsRollup.experience_count: AnalyticsRollup.experience_count + count,
+        AnalyticsRollup.package_sum: AnalyticsRollup.package_sum + package_sum,
+        AnalyticsRollup.package_count: AnalyticsRollup.package_count + package_count,
+    }, synchronize_session=False)
+
+    if not updated:
+        db.add(AnalyticsRollup(
+            company_id=company_id,
+            role=role,
+            final_result=final_result,
+            month=month,
+            experience_count=count,
+            package_sum=package_sum,
+            package_count=package_count
+        ))
+        db.flush()
+
+
+def _add_counter(db: Session, key: CounterKey, count: int) -> None:
+    kind, value = key
+    updated = db.query(AnalyticsCounter).filter(
+        AnalyticsCounter.kind == kind,
+        AnalyticsCounter.key == value
+    ).update({AnalyticsCounter.count: AnalyticsCounter.count + count}, synchronize_session=False)
+
+    if not updated:
+        db.add(AnalyticsCounter(kind=kind, key=value, count=count))
+        db.flush()
+
+
+def apply_experience(db: Session, experience: Experience, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one experience's contribution.
+
+    Runs inside the caller's transaction.
+    """
+    package_sum, package_count = _package(experience)
+    _add_rollup(db, _rollup_key(experience), sign, sign * package_sum, sign * package_count)
+
+    for key, count in Counter(_counter_keys(experience)).items():
+        _add_counter(db, key, sign * count)
+
+
+def reassign_company(db: Session, source_id: int, target_id: int) -> None:
+    """Fold one company's rollup rows into another's after a registry merge"""
+    rows = db.query(AnalyticsRollup).filter(AnalyticsRollup.company_id == source_id).all()
+    for row in rows:
+        key = (target_id, row.role, row.final_result, row.month)
+        counts = (row.experience_count, row.package_sum, row.package_count)
+        db.delete(row)
+        db.flush()
+        _add_rollup(db, key, *counts)
+
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup and counter from the published experiences"""
+    rollups: Dict[RollupKey, list] = defaultdict(lambda: [0, 0.0, 0])
+    counters: Counter = Counter()
+    count = 0
+
+    experiences = db.query(Experience).filter(Experience.is_published == True).yield_per(500)
+    for experience in experiences:
+        package_sum, package_count = _package(experience)
+        totals = rollups[_rollup_key(experience)]
+        totals[0] += 1
+        totals[1] += package_sum
+        totals[2] += package_count
+        counters.update(_counter_keys(experience))
+        count += 1
+
+    db.query(AnalyticsRollup).delete(synchronize_session=False)
+    db.query(AnalyticsCounter).delete(synchronize_session=False)
+    db.add_all(
+        AnalyticsRollup(
+            company_id=company_id,
+            role=role,
+            final_result=final_result,
+            month=month,
+            experience_count=totals[0],
+            package_sum=totals[1],
+            package_count=totals[2]
+        )
+        for (company_id, role, final_result, month), totals in rollups.items()
+    )
+    db.add_all(
+        AnalyticsCounter(kind=kind, key=key, count=total)
+        for (kind, key), total in counters.items()
+    )
+    db.commit()
+    return count
+
+
+def rollups_missing(db: Session) -> bool:
+    """True when there are published experiences but no rollups yet (first start)"""
+    if db.query(AnalyticsRollup.id).first() is not None:
+        return False
+    return db.query(Experience.id).filter(Experience.is_published == True).first() is not None
@@ -0,0 +1,162 @@
+import re
+from typing import List, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.db.database import engine
+from app.db.models import Experience
+
+# Only published experiences are indexed; approval adds them, rejection removes them.
+SQLITE_TABLE = "experiences_fts"
+POSTGRES_TABLE = "experience_search"
+
+
+def build_document(experience: Experience) -> dict:
+    """Collect the searchable text fields of an experience"""
+    questions = []
+    if isinstance(experience.questions_asked, dict):
+        for category, items in experience.questions_asked.items():
+            if isinstance(items, list):
+                questions.extend(str(item) for item in items)
+
+    return {
+        "company_name": experience.company_name or "",
+        "role": experience.role or "",
+        "preparation_strategy": experience.preparation_strategy or "",
+        "rejection_reasons": experience.rejection_reasons or "",
+        "questions": "\n".join(questions),
+    }
+
+
+def _query_terms(query: str) -> List[str]:
+    """Split user input into plain word terms (drops search operators)"""
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchIndex:
+    """Inverted index over experiences: SQLite FTS5 locally, tsvector + GIN on Postgres"""
+
+    def __init__(self, bind: Engine):
+        self.engine = bind
+        self.dialect = bind.dialect.name
+
+    @property
+    def supported(self) -> bool:
+        return self.dialect in ("sqlite", "postgresql")
+
+    def ensure_schema(self) -> bool:
+        """Create the index structures if missing. Returns True when newly created."""
+        if not self.supported:
+            return False
+
+        table = SQLITE_TABLE if self.dialect == "sqlite" else POSTGRES_TABLE
+        if inspect(self.engine).has_table(table):
+            return False
+
+        with self.engine.begin() as conn:
+            if self.dialect == "sqlite":
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING fts5("
+                    "company_name, role, preparation_strategy, rejection_reasons, questions, "
+                    "tokenize='porter unicode61')"
+                ))
+            else:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+                    "experience_id INTEGER PRIMARY KEY REFERENCES experiences(id) ON DELETE CASCADE, "
+                    "document TSVECTOR NOT NULL)"
+                ))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{POSTGRES_TABLE}_document "
+                    f"ON {POSTGRES_TABLE} USING GIN (document)"
+                ))
+        return True
+
+    def index_experience(self, db: Session, experience: Experience) -> None:
+        """Add or replace an experience in the index (joins the caller's transaction)"""
+        if not self.supported:
+            return
+
+        params = build_document(experience)
+        params["id"] = experience.id
+
+        if self.dialect == "sqlite":
+            db.execute(text(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = :id"), {"id": experience.id})
+            db.execute(text(
+                f"INSERT INTO {SQLITE_TABLE} "
+                "(rowid, company_name, role, preparation_strategy, rejection_reasons, questions) "
+                "VALUES (:id, :company_name, :role, :preparation_strategy, :rejection_reasons, :questions)"
+            ), params)
+        else:
+            db.execute(text(
+                f"INSERT INTO {POSTGRES_TABLE} (experience_id, document) VALUES (:id, "
+                "setweight(to_tsvector('english', :company_name), 'A') || "
+                "setweight(to_tsvector('english', :role), 'A') || "
+                "setweight(to_tsvector('english', :questions), 'B') || "
+                "setweight(to_tsvector('english', :preparation_strategy), 'C') || "
+                "setweight(to_tsvector('english', :rejection_reasons), 'C')) "
+                "ON CONFLICT (experience_id) DO UPDATE SET document = EXCLUDED.document"
+            ), params)
+
+    def remove_experience(self, db: Session, experience_id: int) -> None:
+        """Drop an experience from the index (joins the caller's transaction)"""
+        if not self.supported:
+            return
+
+        if self.dialect == "sqlite":
+            db.execute(text(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = :id"), {"id": experience_id})
+        else:
+            db.execute(text(f"DELETE FROM {POSTGRES_TABLE} WHERE experience_id = :id"), {"id": experience_id})
+
+    def rebuild(self, db: Session) -> int:
+        """Re-index every published experience from scratch"""
+        if not self.supported:
+            return 0
+
+        table = SQLITE_TABLE if self.dialect == "sqlite" else POSTGRES_TABLE
+        db.execute(text(f"DELETE FROM {table}"))
+
+        count = 0
+        experiences = db.query(Experience).filter(
+            Experience.is_published == True
+        ).yield_per(500)
+        for experience in experiences:
+            self.index_experience(db, experience)
+            count += 1
+
+        db.commit()
+        return count
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        limit: int,
+        offset: int = 0
+    ) -> List[Tuple[int, float]]:
+        """Return (experience_id, score) pairs, best match first"""
+        terms = _query_terms(query)
+        if not terms or not self.supported:
+            return []
+
+        if self.dialect == "sqlite":
+            # Every term must match; prefix matching keeps partial words useful.
+            # bm25() is lower-is-better, so negate it for a uniform score.
+            match = " ".join(f'"{term}"*' for term in terms)
+            rows = db.execute(text(
+                f"SELECT rowid, -bm25({SQLITE_TABLE}, 10.0, 10.0, 2.0, 2.0, 5.0) AS score "
+                f"FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH :match "
+                "ORDER BY score DESC LIMIT :limit OFFSET :offset"
+            ), {"match": match, "limit": limit, "offset": offset})
+        else:
+            rows = db.execute(text(
+                "SELECT experience_id, ts_rank_cd(document, query) AS score "
+                f"FROM {POSTGRES_TABLE}, plainto_tsquery('english', :q) AS query "
+                "WHERE document @@ query "
+                "ORDER BY score DESC, experience_id DESC LIMIT :limit OFFSET :offset"
+            ), {"q": " ".join(terms), "limit": limit, "offset": offset})
+
+        return [(row[0], float(row[1])) for row in rows]
+
+
+search_index = SearchIndex(engine)
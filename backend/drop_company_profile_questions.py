@@ -0,0 +1,39 @@
+"""
+Script to drop the company_profiles.questions column; suggestions now rank
+interview questions from the question bank.
+Run this once to update your existing database.
+"""
+import sqlite3
+import os
+from pathlib import Path
+
+# Get the database path
+db_path = Path(__file__).parent / "campushire.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    print("New databases are created without the column when you start the server.")
+    exit(0)
+
+try:
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    
+    # Check if column exists
+    cursor.execute("PRAGMA table_info(company_profiles)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    if 'questions' not in columns:
+        print("Column 'questions' does not exist on company_profiles table.")
+    else:
+        cursor.execute("ALTER TABLE company_profiles DROP COLUMN questions")
+        conn.commit()
+        print("Successfully dropped 'questions' column from company_profiles table.")
+    
+    conn.close()
+    print("Database migration completed!")
+    
+except Exception as e:
+    print(f"Error: {e}")
+    print("If you encounter issues, drop the company_profiles table and restart the server;")
+    print("profiles are rebuilt from the published experiences on startup.")
@@ -2,15 +2,32 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
+import asyncio
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
 from app.core.config import settings
-from app.api.v1 import auth, users, experiences, admin, chatbot, analytics, companies
-from app.db.database import engine, Base
+from app.api.v1 import auth, users, experiences, admin, chatbot, analytics, companies, roles
+from app.db.database import engine, Base, SessionLocal
+from app.services.search_index import search_index
+from app.services.company_registry import backfill_company_ids
+from app.services.bookmark_counts import reconcile_bookmark_counts
+from app.services.rollups import rebuild_rollups, rollups_missing
+from app.services.question_bank import question_bank_missing, rebuild_question_bank
+from app.services.package_sketches import package_sketches_missing, rebuild_package_sketches
+from app.services.company_profiles import company_profiles_missing, rebuild_company_profiles
+from app.services.jobs import run_periodically
+from app.services.analytics_snapshots import run_snapshot_scheduler
+from app.services.column_store import column_store
+from app.services.autocomplete import rebuild_autocomplete
 # Import all models to ensure they're registered with Base
-from app.db.models import User, Experience, Bookmark, Admin, AuditLog
+from app.db.models import (
+    User, Experience, Bookmark, Admin, AuditLog, Company, CompanyAlias,
+    AnalyticsRollup, AnalyticsCounter, QuestionCluster, QuestionLshBucket,
+    ExperienceQuestion, CompanyQuestionCount, PackageSketch, AnalyticsSnapshot,
+    PreparationGuide, CompanyProfile
+)
 
 
 # Middleware to add ngrok header to all responses
@@ -28,13 +45,52 @@ async def lifespan(app: FastAPI):
         print("Creating database tables...")
         Base.metadata.create_all(bind=engine)
         print("Database tables created successfully!")
+        db = SessionLocal()
+        try:
+            linked = backfill_company_ids(db)
+            if linked:
+                print(f"Linked {linked} experiences to the company registry")
+            if search_index.ensure_schema():
+                print(f"Search index built for {search_index.rebuild(db)} experiences")
+            if rollups_missing(db):
+                print(f"Analytics rollups built from {rebuild_rollups(db)} experiences")
+            if question_bank_missing(db):
+                print(f"Question bank built from {rebuild_question_bank(db)} experiences")
+            if package_sketches_missing(db):
+                print(f"Package sketches built from {rebuild_package_sketches(db)} experiences")
+            if company_profiles_missing(db):
+                print(f"Company profiles built from {rebuild_company_profiles(db)} experiences")
+            column_store.refresh(db)
+            print(f"Analytics column store loaded {len(column_store)} experiences")
+            print(f"Autocomplete indexed {rebuild_autocomplete(db)} company and role names")
+        finally:
+            db.close()
     except Exception as e:
         print(f"ERROR creating database tables: {e}")
         import traceback
         traceback.print_exc()
+    
+    background_tasks = []
+    if settings.BOOKMARK_RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodically(
+            "reconcile-bookmarks",
+            reconcile_bookmark_counts,
+            settings.BOOKMARK_RECONCILE_INTERVAL_SECONDS
+        )))
+    if settings.AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_periodically(
+            "refresh-autocomplete",
+            rebuild_autocomplete,
+            settings.AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS
+        )))
+    if settings.ANALYTICS_SNAPSHOT_WORKER and settings.ANALYTICS_SNAPSHOT_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_snapshot_scheduler(
+            settings.ANALYTICS_SNAPSHOT_INTERVAL_SECONDS
+        )))
     yield
-    # Shutdown: Cleanup if needed
-    pass
+    # Shutdown: Stop background jobs
+    for task in background_tasks:
+        task.cancel()
 
 
 app = FastAPI(
@@ -68,6 +124,7 @@ app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 app.include_router(chatbot.router, prefix="/api/v1/chatbot", tags=["Chatbot"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
 app.include_router(companies.router, prefix="/api/v1/companies", tags=["Companies"])
+app.include_router(roles.router, prefix="/api/v1/roles", tags=["Roles"])
 
 
 @app.get("/")
@@ -0,0 +1,120 @@
+"""
+Maintenance commands for the CampusHire backend.
+
+Usage:
+    python manage.py rebuild-search
+    python manage.py reconcile-bookmarks
+    python manage.py rebuild-rollups
+    python manage.py rebuild-question-bank
+    python manage.py rebuild-package-sketches
+    python manage.py rebuild-company-profiles
+    python manage.py refresh-snapshots
+    python manage.py benchmark-keywords
+"""
+import argparse
+import time
+
+from app.db.database import Base, SessionLocal, engine
+from app.db.models import (
+    User, Experience, Bookmark, Admin, AuditLog, Company, CompanyAlias,
+    AnalyticsRollup, AnalyticsCounter, QuestionCluster, QuestionLshBucket,
+    ExperienceQuestion, CompanyQuestionCount, PackageSketch, AnalyticsSnapshot,
+    PreparationGuide, CompanyProfile
+)
+from app.services.search_index import search_index
+from app.services.bookmark_counts import reconcile_bookmark_counts
+from app.services.rollups import rebuild_rollups as rebuild_analytics_rollups
+from app.services.question_bank import rebuild_question_bank as rebuild_questions
+from app.services.package_sketches import rebuild_package_sketches as rebuild_sketches
+from app.services.company_profiles import rebuild_company_profiles as rebuild_profiles
+from app.services.analytics_snapshots import refresh_snapshots as refresh_analytics_snapshots
+from app.services.keyword_taxonomy import keyword_matcher
+
+
+def rebuild_search(db):
+    """Rebuild the experience full-text index from published experiences"""
+    search_index.ensure_schema()
+    count = search_index.rebuild(db)
+    print(f"Indexed {count} published experiences.")
+
+
+def reconcile_bookmarks(db):
+    """Recompute every experience's bookmark_count from the bookmarks table"""
+    print(f"Corrected bookmark counts on {reconcile_bookmark_counts(db)} experiences.")
+
+
+def rebuild_rollups(db):
+    """Recompute the analytics rollup tables from published experiences"""
+    print(f"Rolled up {rebuild_analytics_rollups(db)} published experiences.")
+
+
+def rebuild_question_bank(db):
+    """Re-cluster interview questions from published experiences"""
+    print(f"Clustered questions from {rebuild_questions(db)} published experiences.")
+
+
+def rebuild_package_sketches(db):
+    """Recompute the package quantile sketches from published experiences"""
+    print(f"Sketched packages from {rebuild_sketches(db)} published experiences.")
+
+
+def rebuild_company_profiles(db):
+    """Recompute the per-company round/question/skill profiles from published experiences"""
+    print(f"Profiled companies from {rebuild_profiles(db)} published experiences.")
+
+
+def refresh_snapshots(db):
+    """Recompute every precomputed analytics snapshot"""
+    print(f"Refreshed {refresh_analytics_snapshots(db, force=True)} analytics snapshots.")
+
+
+def benchmark_keywords(db):
+    """Time skill extraction over growing preparation strategies (scan time should grow linearly)"""
+    strategy = (
+        "Revised data structures and algorithms for two months, then moved on to "
+        "system design and object-oriented programming, with daily coding practice. "
+    )
+    # Prefer real strategies when there are any
+    rows = db.query(Experience.preparation_strategy).filter(
+        Experience.preparation_strategy.isnot(None)
+    ).limit(1000).all()
+    strategy = " ".join(text for text, in rows) or strategy
+
+    for copies in (1, 10, 100, 1000, 10000):
+        text = strategy * copies
+        started = time.perf_counter()
+        skills = keyword_matcher.labels(text, "skill")
+        elapsed = time.perf_counter() - started
+        print(
+            f"{len(text):>12,} chars  {elapsed * 1000:9.2f} ms  "
+            f"{len(text) / elapsed / 1e6:6.1f} MB/s  {len(skills)} skills"
+        )
+
+
+COMMANDS = {
+    "rebuild-search": rebuild_search,
+    "reconcile-bookmarks": reconcile_bookmarks,
+    "rebuild-rollups": rebuild_rollups,
+    "rebuild-question-bank": rebuild_question_bank,
+    "rebuild-package-sketches": rebuild_package_sketches,
+    "rebuild-company-profiles": rebuild_company_profiles,
+    "refresh-snapshots": refresh_snapshots,
+    "benchmark-keywords": benchmark_keywords,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CampusHire backend maintenance")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        COMMANDS[args.command](db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
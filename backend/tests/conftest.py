@@ -0,0 +1,100 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read at import time, so the test environment goes in first
+_db_dir = tempfile.mkdtemp(prefix="campushire-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'test.db')}",
+    "SECRET_KEY": "test-secret",
+    "SMTP_HOST": "localhost",
+    "SMTP_USER": "tests@example.com",
+    "SMTP_PASSWORD": "unused",
+    "ADMIN_PASSWORD": "admin",
+    "OLLAMA_BASE_URL": "http://127.0.0.1:9",
+    "CACHE_BACKEND": "none",
+    "BOOKMARK_RECONCILE_INTERVAL_SECONDS": "0",
+    "AUTOCOMPLETE_REFRESH_INTERVAL_SECONDS": "0",
+    "ANALYTICS_SNAPSHOT_INTERVAL_SECONDS": "0",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from app.core.security import create_access_token
+from app.db.database import Base, SessionLocal, engine
+from app.db.models import Experience, User
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs the app's startup, which creates the tables
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(full_name="Test User", email="user@example.com", college_name="Test College")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+@pytest.fixture
+def make_experiences(db, user):
+    """Insert published experiences in one commit; created_at comes from CURRENT_TIMESTAMP"""
+    def make(count, **fields):
+        experiences = [
+            Experience(
+                user_id=user.id,
+                company_name=f"Company {i % 3}",
+                role="Software Engineer",
+                package_offered=10.0 + i,
+                final_result="Selected",
+                **{"is_approved": True, "is_published": True, **fields}
+            )
+            for i in range(count)
+        ]
+        db.add_all(experiences)
+        db.commit()
+        return experiences
+    return make
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager counting the statements sent to the database inside it"""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    return counting
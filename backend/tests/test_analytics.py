@@ -0,0 +1,13 @@
+def test_timeseries_package_stats_leave_out_undisclosed_packages(client, db, make_experiences):
+    experiences = make_experiences(4)
+    for experience, package in zip(experiences, [0.0, None, 10.0, 30.0]):
+        experience.package_offered = package
+    db.commit()
+
+    series = client.get("/api/v1/analytics/timeseries").json()["series"]
+
+    assert len(series) == 1
+    assert series[0]["total_experiences"] == 4
+    assert series[0]["average_package"] == 20.0
+    assert series[0]["min_package"] == 10.0
+    assert series[0]["max_package"] == 30.0
@@ -0,0 +1,19 @@
+from app.services.autocomplete import rebuild_autocomplete, role_index
+from app.services.publication import on_publication_change
+
+
+def test_index_changes_only_after_commit(db, make_experiences):
+    experience, = make_experiences(1, is_published=False)
+    rebuild_autocomplete(db)
+
+    experience.is_published = True
+    on_publication_change(db, experience, True)
+    assert role_index.suggest("software") == []
+
+    db.rollback()
+    assert role_index.suggest("software") == []
+
+    experience.is_published = True
+    on_publication_change(db, experience, True)
+    db.commit()
+    assert role_index.suggest("software") == [{"name": "Software Engineer", "experience_count": 1}]
@@ -0,0 +1,40 @@
+from app.db.models import Experience
+
+
+def test_bookmarking_keeps_updated_at_and_analytics_etags(client, db, auth_headers, make_experiences):
+    experience = make_experiences(1)[0]
+    trends = client.get("/api/v1/analytics/trends")
+    assert trends.status_code == 200
+
+    response = client.post(f"/api/v1/experiences/{experience.id}/bookmark", headers=auth_headers)
+    assert response.status_code == 200
+
+    db.expire_all()
+    stored = db.get(Experience, experience.id)
+    assert stored.bookmark_count == 1
+    assert stored.updated_at is None
+    assert client.get(
+        "/api/v1/analytics/trends", headers={"If-None-Match": trends.headers["ETag"]}
+    ).status_code == 304
+
+
+def test_bookmarking_changes_the_etags_of_responses_showing_the_count(
+    client, auth_headers, make_experiences
+):
+    experience = make_experiences(1)[0]
+    urls = ["/api/v1/experiences/", f"/api/v1/experiences/{experience.id}"]
+    etags = {url: client.get(url).headers["ETag"] for url in urls}
+
+    client.post(f"/api/v1/experiences/{experience.id}/bookmark", headers=auth_headers)
+    for url in urls:
+        response = client.get(url, headers={"If-None-Match": etags[url]})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etags[url]
+
+    etags = {url: client.get(url).headers["ETag"] for url in urls}
+    client.delete(f"/api/v1/experiences/{experience.id}/bookmark", headers=auth_headers)
+    for url in urls:
+        response = client.get(url, headers={"If-None-Match": etags[url]})
+        assert response.status_code == 200
+        body = response.json()
+        assert (body[0] if isinstance(body, list) else body)["bookmark_count"] == 0
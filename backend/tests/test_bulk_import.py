@@ -0,0 +1,32 @@
+import json
+
+VALID = {"company_name": "Acme", "role": "SDE", "final_result": "Selected"}
+
+
+def test_ndjson_errors_report_physical_line_numbers(client, auth_headers):
+    body = "\n".join([
+        json.dumps(VALID),
+        "",
+        "{not json",
+        json.dumps({"company_name": "Acme"}),
+        json.dumps(VALID),
+    ])
+
+    response = client.post(
+        "/api/v1/experiences/bulk",
+        content=body,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["inserted"] == 2
+    assert [error["row"] for error in body["errors"]] == [3, 4]
+
+
+def test_json_array_errors_report_array_positions(client, auth_headers):
+    response = client.post("/api/v1/experiences/bulk", json=[VALID, {"role": "SDE"}], headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert [error["row"] for error in response.json()["errors"]] == [1]
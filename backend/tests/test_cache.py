@@ -0,0 +1,23 @@
+import pytest
+from app.core.cache import CacheBackend, SQLiteCache
+
+
+def test_backends_must_implement_the_interface():
+    class Partial(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_sqlite_cache_invalidation_reaches_every_worker(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a, worker_b = SQLiteCache(path), SQLiteCache(path)
+
+    key = worker_a.versioned_key("trends", ["experiences"])
+    worker_a.set(key, {"total": 1}, ttl=60)
+    assert worker_b.get(worker_b.versioned_key("trends", ["experiences"])) == {"total": 1}
+
+    worker_b.invalidate("experiences")
+    assert worker_a.get(worker_a.versioned_key("trends", ["experiences"])) is None
@@ -0,0 +1,56 @@
+from sqlalchemy import event
+from app.db.database import engine
+from app.db.models import Experience
+from app.services.column_store import ColumnStore
+
+
+def _published_total(store, db):
+    return sum(group["total_experiences"] for group in store.aggregate(db, "final_result"))
+
+
+def test_refresh_picks_up_approvals_in_the_watermark_second(client, db, make_experiences):
+    experiences = make_experiences(4, is_approved=False, is_published=False)
+    store = ColumnStore()
+    store.refresh(db)
+
+    # Approvals usually land within one second of each other and of the refreshes
+    for experience in experiences:
+        response = client.post(
+            "/api/v1/admin/experiences/approve",
+            json={"experience_id": experience.id, "action": "approve"}
+        )
+        assert response.status_code == 200
+        db.commit()
+        store.refresh(db)
+
+    assert _published_total(store, db) == 4
+    assert _published_total(store, db) == db.query(Experience).filter(Experience.is_published == True).count()
+
+
+def test_refresh_compares_the_bare_updated_at_column(client, db, make_experiences):
+    experiences = make_experiences(3)
+    store = ColumnStore()
+    store.refresh(db)
+    # The first update is found without a watermark, the second through it
+    experiences[0].final_result = "Rejected"
+    db.commit()
+    store.refresh(db)
+    experiences[1].final_result = "Rejected"
+    db.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        store.refresh(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # The bare column is compared, so ix_experiences_updated_at can serve the seek
+    assert any(statement.endswith("experiences.updated_at >= ?") for statement, _ in statements)
+    assert {group["group"]: group["total_experiences"] for group in store.aggregate(db, "final_result")} == {
+        "Rejected": 2, "Selected": 1
+    }
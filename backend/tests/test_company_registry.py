@@ -0,0 +1,53 @@
+from unittest import mock
+import pytest
+from app.db.database import SessionLocal
+from app.db.models import Company
+from app.services import company_registry
+from app.services.company_registry import normalize_company_name, resolve_company
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Infosys Pvt. Ltd.", "infosys"),
+    ("Google LLC", "google"),
+    ("  Tata Consultancy Services Limited ", "tata consultancy services"),
+    ("Air India", "air india"),
+    ("Oil India Ltd", "oil india"),
+    ("State Bank of India", "state bank of india"),
+    ("Ford Motor Company", "ford motor company"),
+])
+def test_only_legal_form_suffixes_are_ignored(name, key):
+    assert normalize_company_name(name) == key
+
+
+def test_air_india_and_air_are_different_companies(db):
+    air_india = resolve_company(db, "Air India")
+    air = resolve_company(db, "Air")
+    db.commit()
+
+    assert air_india.id != air.id
+
+
+def test_resolve_company_recovers_from_a_concurrent_registration(db):
+    other = SessionLocal()
+    existing = Company(name="Acme", normalized_name="acme")
+    other.add(existing)
+    other.commit()
+    existing_id = existing.id
+    other.close()
+
+    real_find = company_registry.find_company
+    lookups = []
+
+    def find_company(db, name):
+        lookups.append(name)
+        # The first lookup ran before the other request committed
+        return None if len(lookups) == 1 else real_find(db, name)
+
+    with mock.patch.object(company_registry, "find_company", side_effect=find_company):
+        company = resolve_company(db, "ACME Ltd")
+
+    assert company.id == existing_id
+    # The caller's transaction is still usable
+    resolve_company(db, "Globex")
+    db.commit()
+    assert db.query(Company).count() == 2
@@ -0,0 +1,18 @@
+from app.services.company_profiles import rebuild_company_profiles
+from app.services.company_registry import resolve_company
+from app.services.question_bank import rebuild_question_bank, top_questions
+
+
+def test_suggested_questions_are_ranked_by_cluster(client, db, make_experiences):
+    company = resolve_company(db, "Acme")
+    make_experiences(2, company_id=company.id, questions_asked={"dsa": ["Reverse a linked list"]})
+    make_experiences(2, company_id=company.id, questions_asked={"dsa": ["reverse a linked-list."]})
+    make_experiences(3, company_id=company.id, questions_asked={"dsa": ["Two sum"]})
+    rebuild_question_bank(db)
+    rebuild_company_profiles(db)
+
+    suggestions = client.get("/api/v1/companies/Acme/suggestions", params={"ai": "deferred"}).json()
+
+    assert suggestions["interview_questions"] == ["Reverse a linked list", "Two sum"]
+    # The same clusters company-stats reports
+    assert suggestions["interview_questions"] == [text for text, _ in top_questions(db, company.id)]
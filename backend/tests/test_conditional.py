@@ -0,0 +1,18 @@
+def test_unchanged_experience_is_answered_with_304(client, make_experiences):
+    experience = make_experiences(1)[0]
+    url = f"/api/v1/experiences/{experience.id}"
+    etag = client.get(url).headers["ETag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_missing_experience_is_404_whatever_the_validators(client, db, make_experiences):
+    experience = make_experiences(1)[0]
+    url = f"/api/v1/experiences/{experience.id}"
+    etag = client.get(url).headers["ETag"]
+    db.delete(experience)
+    db.commit()
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 404
+    assert client.get(url, headers={"If-None-Match": "*"}).status_code == 404
+    assert client.get("/api/v1/experiences/999999", headers={"If-None-Match": "*"}).status_code == 404
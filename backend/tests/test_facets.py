@@ -0,0 +1,29 @@
+def test_limit_cuts_counted_facets_but_not_package_bands(client, db, make_experiences):
+    experiences = make_experiences(4)
+    for experience, package in zip(experiences, [None, 3.0, 12.0, 40.0]):
+        experience.package_offered = package
+    db.commit()
+
+    body = client.get("/api/v1/experiences/facets", params={"limit": 2}).json()
+
+    assert body["total"] == 4
+    assert all(len(body["facets"][name]) <= 2 for name in ("company", "role", "final_result"))
+    # Bands are never cut, so the higher ones stay visible
+    assert body["facets"]["package_band"] == [
+        {"value": "undisclosed", "count": 1},
+        {"value": "0-5", "count": 1},
+        {"value": "5-10", "count": 0},
+        {"value": "10-20", "count": 1},
+        {"value": "20-30", "count": 0},
+        {"value": "30+", "count": 1},
+    ]
+
+
+def test_facets_follow_the_filters(client, db, make_experiences):
+    make_experiences(6)
+
+    body = client.get("/api/v1/experiences/facets", params={"company_name": "company 1"}).json()
+
+    assert body["total"] == 2
+    assert body["facets"]["company"] == [{"value": "Company 1", "count": 2}]
+    assert body["facets"]["final_result"] == [{"value": "Selected", "count": 2}]
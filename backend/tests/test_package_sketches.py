@@ -0,0 +1,27 @@
+from app.services.package_sketches import rebuild_package_sketches
+
+
+def _count(client, college_name):
+    response = client.get("/api/v1/analytics/package-distribution", params={"college_name": college_name})
+    assert response.status_code == 200
+    return response.json()["count"]
+
+
+def test_profile_college_change_moves_packages_between_college_sketches(
+    client, db, user, auth_headers, make_experiences
+):
+    experiences = make_experiences(2)
+    rebuild_package_sketches(db)
+    assert (_count(client, "Test College"), _count(client, "New College")) == (2, 0)
+
+    response = client.put("/api/v1/users/me", json={"college_name": "New College"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (_count(client, "Test College"), _count(client, "New College")) == (0, 2)
+
+    # A later unpublish rebuilds the new college's sketch from the right rows
+    response = client.post(
+        "/api/v1/admin/experiences/approve",
+        json={"experience_id": experiences[0].id, "action": "reject"}
+    )
+    assert response.status_code == 200
+    assert (_count(client, "Test College"), _count(client, "New College")) == (0, 1)
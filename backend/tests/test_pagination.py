@@ -0,0 +1,74 @@
+from datetime import datetime
+from sqlalchemy import event, text
+from app.api.pagination import NEXT_CURSOR_HEADER, keyset_paginate
+from app.db.database import engine
+from app.db.models import Experience
+
+
+def _page_through(client, url, limit, **params):
+    ids, cursor = [], None
+    for _ in range(20):
+        response = client.get(url, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids.extend(experience["id"] for experience in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+    raise AssertionError(f"cursor never ran out: {ids}")
+
+
+def test_pages_through_rows_sharing_one_timestamp(client, make_experiences):
+    experiences = make_experiences(7)
+    expected = sorted((experience.id for experience in experiences), reverse=True)
+
+    assert _page_through(client, "/api/v1/experiences/", 3) == expected
+
+
+def test_pages_through_whole_second_timestamps(client, db, make_experiences):
+    experiences = make_experiences(7)
+    # The form CURRENT_TIMESTAMP writes: no fractional seconds
+    db.execute(text("UPDATE experiences SET created_at = datetime('2026-01-01', '+' || id || ' minutes')"))
+    db.commit()
+    expected = sorted((experience.id for experience in experiences), reverse=True)
+
+    assert _page_through(client, "/api/v1/experiences/", 3) == expected
+    assert _page_through(client, "/api/v1/experiences/", 2, view="summary") == expected
+
+
+def test_timestamps_are_stored_in_the_current_timestamp_form(db, make_experiences):
+    experience = make_experiences(1, created_at=datetime(2026, 1, 1, 10, 0, 0, 500000))[0]
+
+    stored = db.execute(text("SELECT created_at FROM experiences WHERE id = :id"), {"id": experience.id}).scalar()
+    assert stored == "2026-01-01 10:00:00"
+
+
+def test_cursor_pages_seek_on_a_created_at_index(db, user, make_experiences):
+    make_experiences(5)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    query = db.query(Experience).filter(Experience.is_published == True)
+    _, cursor = keyset_paginate(query, Experience.created_at, Experience.id, None, 2)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        keyset_paginate(query, Experience.created_at, Experience.id, cursor, 2)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    statement, parameters = statements[-1]
+    plan = " ".join(
+        str(row[-1]) for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    )
+    # Served in index order: no scan of the table and no sort
+    assert "USING INDEX ix_experiences_" in plan and "created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_rejects_a_cursor_from_another_sort_order(client, make_experiences):
+    make_experiences(3)
+    cursor = client.get("/api/v1/experiences/", params={"limit": 1}).headers[NEXT_CURSOR_HEADER]
+
+    response = client.get("/api/v1/experiences/", params={"limit": 1, "sort": "popular", "cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,65 @@
+import pytest
+from app.db.models import Bookmark, User
+
+
+@pytest.fixture
+def many_authors(db, user, make_experiences):
+    """60 experiences by 20 authors, half unapproved, all bookmarked by `user`"""
+    authors = [User(full_name=f"Author {i}", email=f"author{i}@example.com") for i in range(20)]
+    db.add_all(authors)
+    db.commit()
+    experiences = make_experiences(60)
+    for i, experience in enumerate(experiences):
+        experience.user_id = authors[i % len(authors)].id
+        experience.is_anonymous = i % 4 == 0
+        if i % 2:
+            experience.is_approved = experience.is_published = False
+        db.add(Bookmark(user_id=user.id, experience_id=experience.id))
+    db.commit()
+    return experiences
+
+
+# Statements per request, independent of page size and number of authors.
+# Authenticated endpoints spend one on loading the current user.
+@pytest.mark.parametrize("url, params, auth, expected", [
+    ("/api/v1/experiences/", {}, False, 3),  # ETag states (experiences, bookmarks), page
+    ("/api/v1/experiences/", {"view": "summary"}, False, 3),
+    ("/api/v1/experiences/", {"sort": "popular"}, False, 3),
+    ("/api/v1/experiences/bookmarks/all", {}, True, 2),
+])
+@pytest.mark.parametrize("limit", [5, 50])
+def test_list_endpoints_use_a_fixed_number_of_queries(
+    client, auth_headers, many_authors, count_queries, url, params, auth, expected, limit
+):
+    headers = auth_headers if auth else {}
+    with count_queries() as statements:
+        response = client.get(url, params={**params, "limit": limit}, headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == min(limit, 30 if url.endswith("/experiences/") else 60)
+    assert len(statements) == expected, statements
+
+
+@pytest.mark.parametrize("url, rows", [
+    ("/api/v1/admin/experiences/pending", 30),
+    ("/api/v1/admin/experiences/all", 60),
+])
+def test_admin_lists_load_authors_in_one_query(client, many_authors, count_queries, url, rows):
+    with count_queries() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(response.json()) == rows
+    assert {experience["user_name"] for experience in response.json()} >= {"Author 1", "Author 19"}
+    assert len(statements) == 1, statements
+
+
+def test_cursor_pages_cost_the_same(client, many_authors, count_queries):
+    first = client.get("/api/v1/experiences/", params={"limit": 5})
+    with count_queries() as statements:
+        response = client.get(
+            "/api/v1/experiences/", params={"limit": 5, "cursor": first.headers["X-Next-Cursor"]}
+        )
+
+    assert response.status_code == 200
+    assert len(statements) == 3, statements
@@ -0,0 +1,14 @@
+from app.services.company_registry import resolve_company
+from app.services.question_bank import rebuild_question_bank, top_questions
+
+
+def test_rebuild_streams_past_one_batch(db, make_experiences):
+    company = resolve_company(db, "Acme")
+    experiences = make_experiences(
+        600,
+        company_id=company.id,
+        questions_asked={"dsa": ["Reverse a linked list", "reverse a linked-list."]}
+    )
+
+    assert rebuild_question_bank(db) == len(experiences)
+    assert top_questions(db, company.id) == [("Reverse a linked list", 600)]